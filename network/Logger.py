@@ -2,7 +2,6 @@
 ### Python standard dependencies
 ###
 import logging
-from functools import partial
 ###
 ### Third-party dependencies
 ###
@@ -11,14 +10,57 @@ import simpy
 ### Project dependencies
 ###
 
+# Record factory in place before any simulation logger was initialised. Each
+# initialisation wraps this, rather than whatever factory is current, so that
+# repeated initialisations don't chain factories
+_base_record_factory = logging.getLogRecordFactory()
+# Formatter shared by every initialisation, so the format is only parsed once
+_sim_formatter = logging.Formatter(
+    "%(name)-10s:Time %(sim_time)-12s:%(levelname)-6s:%(message)s"
+)
+
+# Environment whose time records are stamped with, and the handler installed on the
+# root logger; set by the most recent initialisation
+_sim_env = None
+_sim_handler = None
+
+def _sim_record_factory(*args, **kwargs) -> logging.LogRecord:
+    """ Record factory stamping each record with the simulation time.
+
+    Returns
+    -------
+        logging.LogRecord
+            The log record.
+    """
+    record = _base_record_factory(*args, **kwargs)
+    record.sim_time = _sim_env.now
+    return record
 
 def initialise_sim_logger(env: simpy.Environment, logger_level: int):
-    logging.basicConfig(
-        force=True,
-        level=logger_level,
-        format="%(name)-10s:Time %(asctime)-12s:%(levelname)-6s:%(message)s"
-    )
-
-    def sim_time(env: simpy.Environment, self, record, datefmt=None):
-        return env.now
-    logging.Formatter.formatTime = partial(sim_time, env)
+    """ Configure logging such that records are stamped with the simulation time.
+
+    Records are stamped with the time of the most recently given environment.
+    Initialising again only rebinds the environment and level; the handler and
+    record factory are only installed if they aren't already in place.
+
+    Parameters
+    ----------
+        env :
+            The simpy environment whose time is logged.
+        logger_level :
+            Logging level of the root logger.
+    """
+    global _sim_env, _sim_handler
+    _sim_env = env
+
+    root = logging.getLogger()
+    root.setLevel(logger_level)
+    if _sim_handler is None or _sim_handler not in root.handlers:
+        _sim_handler = logging.StreamHandler()
+        _sim_handler.setFormatter(_sim_formatter)
+        # Replace, rather than add to, whatever handlers the root logger already has
+        for old_handler in root.handlers:
+            old_handler.close()
+        root.handlers[:] = [_sim_handler]
+    if logging.getLogRecordFactory() is not _sim_record_factory:
+        logging.setLogRecordFactory(_sim_record_factory)
@@ -2,6 +2,7 @@
 ### Python standard dependencies
 ###
 import logging
+from typing import Optional
 ###
 ### Third-party dependencies
 ###
@@ -16,7 +17,10 @@ class Node:
     """ A node with various peripherals.
     """
     
-    def __init__(self, env : simpy.Environment, name : str):
+    def __init__(
+        self, env : simpy.Environment, name : str,
+        history_capacity : Optional[int] = 100
+    ):
         """ Class constructor.
 
         Parameters
@@ -25,11 +29,17 @@ class Node:
                 The simpy environment.
             name :
                 A unique identifier of the node.
+            history_capacity :
+                Maximum number of transmitted and received packets that the node's
+                radio keeps a history of. Optional; if None, the radio keeps a
+                history of every packet.
         """
         self._env = env
         self._name = name
         # TODO: Add as constructor argument; injection
-        self._radio = Radio(self._env, self._name)
+        self._radio = Radio(
+            self._env, self._name, history_capacity=history_capacity
+        )
         self._protocol = Protocol(self._env, self._radio)
         
         self._logger = logging.getLogger(self._name)
@@ -15,6 +15,8 @@ class DataPacket:
     """ A packet containing data to be passed between nodes.
     """
 
+    __slots__ = ("_src", "_dest", "_contents")
+
     def __init__(
         self, src : str, dest : str,
         fields : Optional[Mapping[str, Callable[[], str]]] = None,
@@ -46,9 +48,9 @@ class DataPacket:
         self._dest = dest
             
         if fields is not None:
-            self._contents = {}
-            for field_name, field_val in fields.items():
-                self._contents[field_name] = field_val()
+            self._contents = {
+                field_name : field_val() for field_name, field_val in fields.items()
+            }
         else:
             self._contents = contents
 
@@ -75,11 +77,12 @@ class DataPacket:
             bool
                 True if the packets are equal, otherwise false.
         """
+        if not isinstance(other, DataPacket):
+            return NotImplemented
         return \
-            (self._src == other._src)   and \
-            (self._dest == other._dest) and \
-            (self._contents == other._contents)
-        
+            (self._src, self._dest, self._contents) == \
+            (other._src, other._dest, other._contents)
+
     def fields(self) -> Iterable[str]:
         """ Getter for the field names that are carried within the data packet.
 
@@ -1,7 +1,7 @@
 ###
 ### Python standard dependencies
 ###
-from typing import Iterable, Optional, Tuple
+from typing import Iterable, Optional, Tuple, Union
 import logging
 ###
 ### Third-party dependencies
@@ -18,7 +18,7 @@ from matplotlib.collections import PatchCollection
 ###
 from .Node import Node
 from .World import World
-from .Radio import Radio
+from .Radio import Radio, RadioPacket
 
 def packet_routing(
     nodes : Iterable[Node], world : World,
@@ -40,39 +40,53 @@ def packet_routing(
             not specified, will plot all events from start_time.
     """
     # Mapping from event type to various things we'll use for plotting that event type:
-    #     label   : The label to use for the the event type.
-    #     format  : kwargs for formatting the rectangle representing the kwarg
-    #     patches : List of rectangles of the event type.
+    #     label      : The label to use for the the event type.
+    #     format     : kwargs for formatting the rectangles representing the event type
+    #     patches    : List of rectangles of the event type.
+    #     sim_events : List of the events plotted, parallel to the list of rectangles.
+    #     collection : Collection drawing all rectangles of the event type.
     events = {
         Radio.RadioEvent.Status.SUCCESS_TX : {
-            "label"   : "TX Success",
-            "format"  : { "facecolor" : "seagreen", "edgecolor" : "black" },
-            "patches" : []
+            "label"      : "TX Success",
+            "format"     : { "facecolor" : "seagreen", "edgecolor" : "black" },
+            "patches"    : [],
+            "sim_events" : [],
+            "collection" : None
         },
         Radio.RadioEvent.Status.SUCCESS_RX : {
-            "label"   : "RX Success",
-            "format"  : { "facecolor" : "firebrick", "edgecolor" : "black" },
-            "patches" : []            
+            "label"      : "RX Success",
+            "format"     : { "facecolor" : "firebrick", "edgecolor" : "black" },
+            "patches"    : [],
+            "sim_events" : [],
+            "collection" : None
         },
         World.CollisionEvent.Status.COLLISION : {
-            "label"   : "Collision",
-            "format"  : { "facecolor" : "goldenrod", "edgecolor" : "black" },
-            "patches" : []
+            "label"      : "Collision",
+            "format"     : { "facecolor" : "goldenrod", "edgecolor" : "black" },
+            "patches"    : [],
+            "sim_events" : [],
+            "collection" : None
         },
         Radio.RadioEvent.Status.NOTHING_RX : {
-            "label"   : "RX Fail: Nothing",
-            "format"  : { "facecolor" : "salmon", "edgecolor" : "black" },
-            "patches" : []
+            "label"      : "RX Fail: Nothing",
+            "format"     : { "facecolor" : "salmon", "edgecolor" : "black" },
+            "patches"    : [],
+            "sim_events" : [],
+            "collection" : None
         },
         Radio.RadioEvent.Status.DROPPED_MODE : {
-            "label"   : "RX Fail: Mode",
-            "format"  : { "facecolor" : "cyan", "edgecolor" : "black", "hatch" : "///" },
-            "patches" : []
+            "label"      : "RX Fail: Mode",
+            "format"     : { "facecolor" : "cyan", "edgecolor" : "black", "hatch" : "///" },
+            "patches"    : [],
+            "sim_events" : [],
+            "collection" : None
         },
         Radio.RadioEvent.Status.DROPPED_RSSI : {
-            "label"   : "RX Fail: RSSI",
-            "format"  : { "facecolor" : "violet", "edgecolor" : "black", "hatch" : "..." },
-            "patches" : []
+            "label"      : "RX Fail: RSSI",
+            "format"     : { "facecolor" : "violet", "edgecolor" : "black", "hatch" : "..." },
+            "patches"    : [],
+            "sim_events" : [],
+            "collection" : None
         }
     }
     
@@ -82,34 +96,18 @@ def packet_routing(
     node_height = 1.0
     inter_node_height = 0.2
 
-    axs.set_yticks(np.arange(
-        start=inter_node_height + node_height / 2,
-        stop=len(nodes) * node_height + inter_node_height,
-        step=inter_node_height + node_height
-    ))
+    # Mapping from node name -> index of the node in the iterable of nodes
+    name_to_idx = {node._name : node_idx for node_idx, node in enumerate(nodes)}
+
+    # Vertical position of the bottom edge of each node's event rectangles
+    y_anchors = inter_node_height + np.arange(len(nodes)) * (node_height + inter_node_height)
+
+    axs.set_yticks(y_anchors + node_height / 2)
     axs.set_yticklabels([node._name for node in nodes])
     axs.set_ylim(0, len(nodes) * (node_height + inter_node_height) + inter_node_height)
     axs.set_ylabel("Node")
     axs.set_xlabel("Simulation Time")
     
-    def get_node_index(name : str) -> int:
-        """ Get the index of a node in the iterable of nodes.
-
-        Arguments
-        ---------
-            name :
-                Name of the node we're looking for.
-
-        Returns
-        -------
-            int :
-                The index of the node we're looking for.
-        """
-        for node_idx, node in enumerate(nodes):
-            if node._name == name:
-                return node_idx
-        raise RuntimeError(f"Node {name} is not in the list of provided nodes.")
-    
     def event_rectangle_anchor(node_idx : int, start_time : int) -> Tuple[float, float]:
         """ Generate the anchor point (bottom right corner) of event rectangle.
 
@@ -125,32 +123,38 @@ def packet_routing(
             Tuple[float, float] :
                 The (x,y) coordinate of the rectangle's anchor point.
         """
-        return (
-            start_time, inter_node_height + node_idx * (node_height + inter_node_height)
-        )
+        return (start_time, y_anchors[node_idx])
 
-    def generate_single_packet_rectangle(
-        node_idx : int, event : Radio.RadioEvent
-    ) -> Rectangle:
-        """ Generate a rectangle displaying a single-packet event.
+    def add_single_packet_rectangles(
+        node_idx : int, status : Radio.RadioEvent.Status,
+        sim_events : Iterable[Tuple[float, RadioPacket]]
+    ):
+        """ Generate rectangles displaying all single-packet events of a given type
+        at a node, and add them to the event type's rectangles.
 
         Arguments
         ---------
             node_idx :
                 The node's index in the list of nodes being plotted.
-            event :
-                The event we're generating a rectangle for.
-        
-        Returns
-        -------
-            Rectangle :
-                The rectangle positioned appropriately for the event we're representing.
+            status :
+                The type of the events.
+            sim_events :
+                The (time, packet) pair of each event we're generating a rectangle for.
         """
-        return Rectangle(
-            xy=event_rectangle_anchor(node_idx, event.time - event.packet.duration),
-            width=event.packet.duration, height=node_height,
-            **events[event.status]["format"], label=f"{event}"
+        if not sim_events:
+            return
+        times, packets = zip(*sim_events)
+        # Rectangles span the packet's duration, ending when it traversed the radio
+        widths = np.fromiter(
+            (packet.duration for packet in packets), dtype=np.float64, count=len(packets)
         )
+        lefts = np.asarray(times, dtype=np.float64) - widths
+        y_anchor = y_anchors[node_idx]
+        events[status]["patches"] += [
+            Rectangle(xy=(left, y_anchor), width=width, height=node_height)
+            for left, width in zip(lefts.tolist(), widths.tolist())
+        ]
+        events[status]["sim_events"] += sim_events
 
     def generate_double_packet_rectangle(
         node_idx : int, event : World.CollisionEvent
@@ -171,8 +175,7 @@ def packet_routing(
         """
         return Rectangle(
             xy=event_rectangle_anchor(node_idx, event.time),
-            width=collision_event.packet_a.duration, height=node_height,
-            **events[event.status]["format"], label=f"{event.packet_a}\n{event.packet_b}"
+            width=event.packet_a.duration, height=node_height
         )
 
     ###
@@ -184,10 +187,9 @@ def packet_routing(
     for node_idx, node in enumerate(nodes):
         history = node._radio._tx_packet_history
         for event_type in tx_event_types:
-            for tx_event in Radio.RadioEvent.get_events(history, event_type):
-                events[event_type]["patches"].append(
-                    axs.add_patch(generate_single_packet_rectangle(node_idx, tx_event))
-                )
+            add_single_packet_rectangles(
+                node_idx, event_type, Radio.RadioEvent.get_events(history, event_type)
+            )
 
     ###
     ### Receive Events
@@ -200,21 +202,34 @@ def packet_routing(
     ]
     for node_idx, node in enumerate(nodes):
         history = node._radio._rx_packet_history
-        for event_type in rx_event_types:            
-            for rx_event in Radio.RadioEvent.get_events(history, event_type):
-                events[event_type]["patches"].append(
-                    axs.add_patch(generate_single_packet_rectangle(node_idx, rx_event))
-                )
+        for event_type in rx_event_types:
+            add_single_packet_rectangles(
+                node_idx, event_type, Radio.RadioEvent.get_events(history, event_type)
+            )
 
     ###
     ### Collision Events
     ###
     for collision_event in world._collision_packet_history:
-        node_idx = get_node_index(collision_event.packet_a.dest())
+        name = collision_event.packet_a.dest()
+        if name not in name_to_idx:
+            raise RuntimeError(f"Node {name} is not in the list of provided nodes.")
+        node_idx = name_to_idx[name]
         events[World.CollisionEvent.Status.COLLISION]["patches"].append(
-            axs.add_patch(generate_double_packet_rectangle(node_idx, collision_event))
+            generate_double_packet_rectangle(node_idx, collision_event)
+        )
+        events[World.CollisionEvent.Status.COLLISION]["sim_events"].append(
+            collision_event
         )
 
+    # Draw all rectangles of each event type as a single collection rather than
+    # adding every rectangle as its own artist
+    for event_type in events.values():
+        if event_type["patches"]:
+            event_type["collection"] = axs.add_collection(PatchCollection(
+                event_type["patches"], match_original=False, **event_type["format"]
+            ))
+
     # Since matplotlib won't automatically adjust the axis to accomodate patches,
     # we do this at the end of all the plotting
     if plot_interval is None:
@@ -223,25 +238,69 @@ def packet_routing(
     else:
         axs.set_xlim(left=start_time, right=plot_interval, auto=False)
 
-    # Hover animations for each event we've plotted, giving a bit of text information
-    mplcursors.cursor(hover=True).connect(
-        "add", lambda sel: sel.annotation.set_text(sel.artist.get_label())
+    def hover_text(
+        status : Union[Radio.RadioEvent.Status, World.CollisionEvent.Status],
+        event : Union[Tuple[float, RadioPacket], World.CollisionEvent]
+    ) -> str:
+        """ Generate the text displayed when hovering over an event's rectangle.
+
+        Arguments
+        ---------
+            status :
+                The type of the event being hovered over.
+            event :
+                The event being hovered over; either the (time, packet) pair of a
+                radio event, or a collision event.
+
+        Returns
+        -------
+            str :
+                Text describing the event.
+        """
+        if status == World.CollisionEvent.Status.COLLISION:
+            return f"{event.packet_a}\n{event.packet_b}"
+        time, packet = event
+        return f"{Radio.RadioEvent(status=status, time=time, packet=packet)}"
+
+    # Hover animations for each event we've plotted, giving a bit of text information.
+    # Picking a collection gives the index of the picked rectangle within it as the
+    # first element of the selection index. Text is only generated for events that
+    # actually get hovered over
+    sim_events_by_collection = {
+        event_type["collection"] : (status, event_type["sim_events"])
+        for status, event_type in events.items() if event_type["collection"] is not None
+    }
+
+    def hover_callback(sel : mplcursors.Selection):
+        """ Callback for hovering over a rectangle; annotate with the event's text.
+
+        Parameters
+        ----------
+            sel :
+                The selection made by hovering.
+        """
+        status, sim_events = sim_events_by_collection[sel.artist]
+        sel.annotation.set_text(hover_text(status, sim_events[sel.index[0]]))
+    # Only the event collections are registered for hovering, so each mouse movement
+    # is tested against one artist per event type
+    mplcursors.cursor(list(sim_events_by_collection), hover=True).connect(
+        "add", hover_callback
     )
 
     # Generate checkboxes that we can use to toggle whether events of a particular
     # type are plotted or not
-    patches_by_label = {}
+    collections_by_label = {}
     actives = []
     colours = []
-    for event_type in events.keys():
-        if events[event_type]["patches"] is not []:
-            patches_by_label[events[event_type]["label"]] = events[event_type]["patches"]
-            actives.append(events[event_type]["patches"][0].get_visible())
-            colours.append(events[event_type]["format"]["facecolor"])
+    for event_type in events.values():
+        if event_type["collection"] is not None:
+            collections_by_label[event_type["label"]] = event_type["collection"]
+            actives.append(event_type["collection"].get_visible())
+            colours.append(event_type["format"]["facecolor"])
 
     checkbox_axs = axs.inset_axes([0.0, 0.0, 0.12, 0.12])
     checkboxes = CheckButtons(
-        ax=checkbox_axs, labels=patches_by_label.keys(),
+        ax=checkbox_axs, labels=collections_by_label.keys(),
         actives=actives, label_props={"color" : colours},
         frame_props={"edgecolor" : colours}, check_props={"facecolor" : colours}
     )
@@ -255,7 +314,7 @@ def packet_routing(
             label :
                 The patch type we're manipulating.
         """
-        for patch in patches_by_label[label]:
-            patch.set_visible(not patch.get_visible())
-            patch.figure.canvas.draw_idle()
+        collection = collections_by_label[label]
+        collection.set_visible(not collection.get_visible())
+        collection.figure.canvas.draw_idle()
     checkboxes.on_clicked(checkbox_callback)
@@ -31,7 +31,7 @@ class Protocol:
         """
         self._env = env
         self._schedule_manager = ScheduleManager(
-            self._env, transmit_cb=radio.transmit, receive_cb=radio.receive,
+            self._env, transmit_cb=radio.start_transmit, receive_cb=radio.receive,
             handle_packet_cb=self.handle_packet
         )
 
@@ -2,10 +2,9 @@
 ### Python standard dependencies
 ###
 import logging
-from enum import Enum
-from collections import deque
+from enum import Enum, IntEnum
 from dataclasses import dataclass
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Iterator, Tuple
 ###
 ### Third-party dependencies
 ###
@@ -17,7 +16,7 @@ import numpy as np
 from .SharedEvent import SharedEvent
 from .Packet import DataPacket
 
-class RadioMode(Enum):
+class RadioMode(IntEnum):
     """ States that a radio may be in.
     """
     # The radio is off; neither transmitting nor receiving
@@ -27,7 +26,10 @@ class RadioMode(Enum):
     # The radio is in transmit mode
     TX  = 2
 
-@dataclass
+    # Stringify as the member name, as a plain Enum does, rather than as an int
+    __str__ = Enum.__str__
+
+@dataclass(slots=True)
 class RadioPacket:
     """ Packet which is exchanged between radios.
     """
@@ -63,10 +65,9 @@ class RadioPacket:
                     True if the radio packets are equal, otherwise false.
             """
             return \
-            (self.data_packet == other.data_packet) and \
-            (self.duration == other.duration)       and \
-            (self.rssi == other.rssi)
-    
+                (self.data_packet, self.duration, self.rssi) == \
+                (other.data_packet, other.duration, other.rssi)
+
     def src(self) -> str:
         """ Getter for the source node identifier.
 
@@ -86,18 +87,136 @@ class RadioPacket:
                 Destination node identifier.
         """
         return self.data_packet._dest
-    
+
+class RadioEventRing:
+    """ Circular buffer of radio events, stored as a struct-of-arrays.
+
+    The status, time and packet of each event are held in parallel arrays so that
+    events can be filtered by status without iterating over Python objects; the
+    RadioEvent for an entry is only constructed when that entry is retrieved.
+    """
+
+    def __init__(self, capacity : Optional[int] = None):
+        """ Class constructor.
+
+        Parameters
+        ----------
+            capacity :
+                Maximum number of events held; once full, the oldest event is
+                overwritten, and with no capacity every event is discarded.
+                Optional; if not specified, the buffer holds every event, growing
+                its arrays as required.
+        """
+        if capacity is not None and capacity < 0:
+            raise RuntimeError(
+                f"RadioEventRing capacity ({capacity}) can't be negative."
+            )
+        self.capacity = capacity
+        size = capacity if capacity is not None else 16
+        self.status = np.empty(size, dtype=np.int8)
+        self.time = np.empty(size, dtype=np.float64)
+        self.packet = np.empty(size, dtype=object)
+        # Index of the slot that the next event will be written to
+        self.head = 0
+        # Number of events currently held
+        self.count = 0
+
+    def __len__(self) -> int:
+        """ Number of events held in the buffer.
+
+        Returns
+        -------
+            int
+                The number of events.
+        """
+        return self.count
+
+    def __getitem__(self, idx : int) -> "Radio.RadioEvent":
+        """ Retrieve an event, where events are indexed from oldest to newest.
+
+        Parameters
+        ----------
+            idx :
+                Index of the event; negative indices count back from the newest.
+
+        Returns
+        -------
+            Radio.RadioEvent
+                The event at the given index.
+        """
+        if idx < 0:
+            idx += self.count
+        if not 0 <= idx < self.count:
+            raise IndexError("RadioEventRing index out of range.")
+        slot = (self.head - self.count + idx) % len(self.status)
+        return Radio.RadioEvent(
+            status=Radio.RadioEvent.Status(self.status[slot]),
+            time=self.time[slot].item(), packet=self.packet[slot]
+        )
+
+    def __iter__(self) -> Iterator["Radio.RadioEvent"]:
+        """ Iterate over the events from oldest to newest.
+
+        Returns
+        -------
+            Iterator[Radio.RadioEvent]
+                Iterator over the held events.
+        """
+        for idx in range(self.count):
+            yield self[idx]
+
+    def slots(self) -> np.ndarray:
+        """ Array slots holding events, ordered from oldest to newest event.
+
+        Returns
+        -------
+            np.ndarray
+                Indices into the status, time and packet arrays.
+        """
+        capacity = len(self.status)
+        return (self.head - self.count + np.arange(self.count)) % capacity
+
+    def push(self, status : int, time : float, packet : RadioPacket):
+        """ Append an event, overwriting the oldest event if the buffer is full,
+        or growing the buffer if it's unbounded.
+
+        Parameters
+        ----------
+            status :
+                Value of the event's Radio.RadioEvent.Status.
+            time :
+                The time at which the packet traverses the radio.
+            packet :
+                The radio packet traversing the radio.
+        """
+        capacity = len(self.status)
+        if capacity == 0:
+            return
+        # An unbounded buffer never overwrites, so its events always run from the
+        # first slot onwards and its arrays can be grown in place; doubling them
+        # keeps pushes amortised constant time
+        if self.capacity is None and self.count == capacity:
+            capacity *= 2
+            self.status = np.resize(self.status, capacity)
+            self.time = np.resize(self.time, capacity)
+            self.packet = np.resize(self.packet, capacity)
+        self.status[self.head] = status
+        self.time[self.head] = time
+        self.packet[self.head] = packet
+        self.head = (self.head + 1) % capacity
+        self.count = min(self.count + 1, capacity)
+
 class Radio:
     """ Interface between a node and the world allowing the exchange of packets.
     """
 
-    @dataclass
+    @dataclass(slots=True)
     class RadioEvent:
         """ Logging event, keeping track of the time at which a packet traverses
         the radio.
         """
 
-        class Status(Enum):
+        class Status(IntEnum):
             """
             """
             # Packet was transmitted successfully
@@ -110,23 +229,43 @@ class Radio:
             DROPPED_RSSI = 4
             # Packet wasn't delivered because radio wasn't in RX mode
             DROPPED_MODE = 5
+
+            # Stringify as the member name, as a plain Enum does, rather than as an int
+            __str__ = Enum.__str__
             
         # Status of the packet that has traversed the radio
         status : Status
         # The time at which the packet traverses the radio. For a transmitted packet,
         # this is the time at which the transmission has ended. For a received
         # packet, this is the time at which the packet has been received.
-        time : int
+        time : float
         # The radio packet traversing the radio 
         packet : RadioPacket
 
         @staticmethod
         def get_events(
-            events : Iterable["RadioEvent"], status : "Radio.RadioEvent.Status"
-        ) -> Iterable["RadioEvent"]:
-            """
+            events : RadioEventRing, status : "Radio.RadioEvent.Status"
+        ) -> Iterable[Tuple[float, RadioPacket]]:
+            """ Retrieve all events of a given status, from oldest to newest.
+
+            Events are returned as (time, packet) pairs rather than RadioEvents,
+            since the status is already known to the caller.
+
+            Parameters
+            ----------
+                events :
+                    The event history we're filtering.
+                status :
+                    The status of the events to retrieve.
+
+            Returns
+            -------
+                Iterable[Tuple[float, RadioPacket]]
+                    The time and radio packet of each event with the given status.
             """
-            return [packet for packet in events if packet.status == status]
+            slots = events.slots()
+            slots = slots[np.flatnonzero(events.status[slots] == status.value)]
+            return list(zip(events.time[slots].tolist(), events.packet[slots]))
         
         def __str__(self) -> str:
             """ Stringify the packet event.
@@ -152,12 +291,14 @@ class Radio:
                     True if the packet events are equal, otherwise false.
             """
             return \
-                (self.status == other.status) and \
-                (self.time == other.time)     and \
-                (self.packet == other.packet)
+                (self.status, self.time, self.packet) == \
+                (other.status, other.time, other.packet)
 
             
-    def __init__(self, env : simpy.Environment, node_name : str):
+    def __init__(
+        self, env : simpy.Environment, node_name : str,
+        history_capacity : Optional[int] = 100
+    ):
         """ Class constructor.
 
         Parameters
@@ -167,6 +308,10 @@ class Radio:
             node_name :
                 Name of the node owning the radio; allows us to create a logger
                 with a useful name.
+            history_capacity :
+                Maximum number of transmitted and received packets that the radio
+                keeps a history of. Optional; if None, the radio keeps a history of
+                every packet.
         """
         self._env = env
         self._logger = logging.getLogger(node_name + " Radio")
@@ -174,8 +319,10 @@ class Radio:
         self._threshold_rssi = 0.1
         
         self._mode = RadioMode.OFF
-        # Event used to transmit packets to the world
-        self._transmit_event = SharedEvent(self._env)
+        # Queue used to transmit packets to the world, shared by all of the radios
+        # within it; None until the radio is placed in a world, in which case
+        # there's nothing to route transmitted packets
+        self._transmit_queue = None
         # Event used to receive packets from the world
         self._receive_event = SharedEvent(self._env)
         # Process handle when the world has routed a packet to this radio
@@ -185,8 +332,8 @@ class Radio:
         self._pending_rx = None
         
         # Circular buffers holding transmitted and received packets
-        self._tx_packet_history = deque(maxlen=100)
-        self._rx_packet_history = deque(maxlen=100)
+        self._tx_packet_history = RadioEventRing(capacity=history_capacity)
+        self._rx_packet_history = RadioEventRing(capacity=history_capacity)
         
     def transmit(self, duration : int, packet : DataPacket):
         """ Transmit a packet; suspend the radio in transmit mode and
@@ -199,25 +346,57 @@ class Radio:
             packet :
                 The data packet we're sending.
         """
+        yield self.start_transmit(duration, packet)
+
+    def start_transmit(self, duration : int, packet : DataPacket) -> simpy.Event:
+        """ Begin transmitting a packet; put the radio in transmit mode and pass the
+        packet to the world for routing. The transmission completes by itself once
+        the packet's duration has elapsed, so unlike `transmit` this doesn't need to
+        be run as a process.
+
+        Parameters
+        ----------
+            duration :
+                Duration in simulation time of the packet.
+            packet :
+                The data packet we're sending.
+
+        Returns
+        -------
+            simpy.Event
+                Event which is processed once the transmission completes.
+        """
         self._mode = RadioMode.TX
         
         # TODO: Choose RSSI or tx power or whatever based on Radio parameter
         tx_packet = RadioPacket(
             data_packet=packet, duration=duration, rssi=1.0
         )
-        self._transmit_event.reactivate(tx_packet)
-        self._logger.debug(f"Begins TX. Packet: {tx_packet}")
-        yield self._env.timeout(duration)
+        if self._transmit_queue is not None:
+            self._transmit_queue.put(tx_packet)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Begins TX. Packet: %s", tx_packet)
 
-        self._mode = RadioMode.OFF
-        
-        self._tx_packet_history.append(
-            self.RadioEvent(
-                status=self.RadioEvent.Status.SUCCESS_TX, time=self._env.now,
+        def complete_transmit(event : simpy.Event):
+            """ Take the radio out of transmit mode and log the transmission.
+
+            Parameters
+            ----------
+                event :
+                    The timeout for the packet's duration.
+            """
+            self._mode = RadioMode.OFF
+            
+            self._tx_packet_history.push(
+                status=self.RadioEvent.Status.SUCCESS_TX.value, time=self._env.now,
                 packet=tx_packet
             )
-        )
-        self._logger.debug(f"Completes TX.")
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Completes TX.")
+
+        tx_timeout = self._env.timeout(duration)
+        tx_timeout.callbacks.append(complete_transmit)
+        return tx_timeout
 
     def notify_intent_to_deliver(self, packet : RadioPacket) -> bool:
         """ Check whether the delivery of a packet is feasible based on:
@@ -241,24 +420,22 @@ class Radio:
         """
         # If the radio isn't in RX mode, then we drop the packet 
         if self._mode != RadioMode.RX:
-            self._rx_packet_history.append(
-                self.RadioEvent(
-                    status=self.RadioEvent.Status.DROPPED_MODE,
-                    time=self._env.now + packet.duration, packet=packet
-                )
+            self._rx_packet_history.push(
+                status=self.RadioEvent.Status.DROPPED_MODE.value,
+                time=self._env.now + packet.duration, packet=packet
             )
-            self._logger.debug(self._rx_packet_history[-1])
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("%s", self._rx_packet_history[-1])
             return False
 
         # Packet RSSI was too low to be received, so drop the packet
         if packet.rssi < self._threshold_rssi:
-            self._rx_packet_history.append(
-                self.RadioEvent(
-                    status=self.RadioEvent.Status.DROPPED_RSSI,
-                    time=self._env.now + packet.duration, packet=packet
-                )
+            self._rx_packet_history.push(
+                status=self.RadioEvent.Status.DROPPED_RSSI.value,
+                time=self._env.now + packet.duration, packet=packet
             )
-            self._logger.debug(self._rx_packet_history[-1])
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("%s", self._rx_packet_history[-1])
             return False
 
         # If we get to this point, there's nothing prohibiting our receiving the
@@ -282,30 +459,42 @@ class Radio:
                 The data packet we're received. If we didn't receive anything,
                 will return None.
         """
-        start_time = self._env.now
-        end_time = self._env.now + duration
+        # Polled once per receive rather than per loop iteration or log call;
+        # the level can't sensibly change part-way through a scheduled receive
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        env = self._env
+        start_time = env.now
+        end_time = start_time + duration
         self._mode = RadioMode.RX
-        self._logger.debug(f"Begins RX. Will complete at {end_time}")
+        if debug:
+            self._logger.debug("Begins RX. Will complete at %s", end_time)
 
         packet = None
+        # Timeout for the end of the scheduled period; created once and kept armed
+        # across any packets that wake the radio before the period is over
+        listening = None
         # Keep receiving for the duration of the scheduled period; allows us to
         # ignore any dropped packets that have too low signal power and stay
         # listening in case another one comes in that the radio can hear
-        while self._env.now < end_time:
+        while True:
+            now = env.now
+            if now >= end_time:
+                break
+            if listening is None:
+                listening = env.timeout(end_time - now)
             # We can either receive something or timeout on the scheduled receive
             # period
             receiving = self._receive_event.event
-            listening = self._env.timeout(end_time - self._env.now)
-            rx_packet = yield self._env.any_of([receiving, listening])
+            rx_packet = yield env.any_of((receiving, listening))
+            now = env.now
 
             if receiving in rx_packet:
                 packet = receiving.value
-                self._logger.debug(f"Receives Packet: {packet}")
-                self._rx_packet_history.append(
-                    self.RadioEvent(
-                        status=self.RadioEvent.Status.SUCCESS_RX,
-                        time=self._env.now, packet=packet
-                    )
+                if debug:
+                    self._logger.debug("Receives Packet: %s", packet)
+                self._rx_packet_history.push(
+                    status=self.RadioEvent.Status.SUCCESS_RX.value,
+                    time=now, packet=packet
                 )
                 packet = packet.data_packet
             else:
@@ -313,22 +502,20 @@ class Radio:
                 # for both radio turning off and packet collision
                 if self._pending_rx != None and self._pending_rx.is_alive == True:
                     self._pending_rx.interrupt("Radio stopped being in receive mode!")
-                else:
+                elif debug:
                     self._logger.debug("No packet was received.")
 
                 # If we didn't get a packet during the listening period, log it
                 # as a blank packet to denote the fact that we didn't receive anything
                 if packet is None:
-                    self._rx_packet_history.append(
-                        self.RadioEvent(
-                            status=self.RadioEvent.Status.NOTHING_RX, time=self._env.now,
-                            packet=RadioPacket(
-                                data_packet=None, duration=self._env.now - start_time,
-                                rssi=None
-                            )
+                    self._rx_packet_history.push(
+                        status=self.RadioEvent.Status.NOTHING_RX.value, time=now,
+                        packet=RadioPacket(
+                            data_packet=None, duration=now - start_time, rssi=None
                         )
                     )
                 
-        self._logger.debug("Completes RX.")
+        if debug:
+            self._logger.debug("Completes RX.")
         self._mode = RadioMode.OFF
         return packet
@@ -1,8 +1,8 @@
 ###
 ### Python standard dependencies
 ###
-from enum import Enum
-from dataclasses import dataclass
+from enum import Enum, IntEnum
+from dataclasses import dataclass, field
 from typing import Optional, Callable, Union
 ###
 ### Third-party dependencies
@@ -14,7 +14,7 @@ from typing import Optional, Callable, Union
 from .Radio import RadioMode
 from .Packet import DataPacket
 
-class ScheduleState(Enum):
+class ScheduleState(IntEnum):
     """ States that a schedule may be in.
     """
     # The schedule is active and the schedule manager can use it when
@@ -26,8 +26,14 @@ class ScheduleState(Enum):
     # it when evaluating which schedule executes next
     # TODO: Going from suspended -> active should modify the start field
     SUSPENDED = 3
+    # The schedule has been cancelled and the schedule manager can discard
+    # it without enacting any of its remaining events
+    CANCELLED = 4
 
-@dataclass
+    # Stringify as the member name, as a plain Enum does, rather than as an int
+    __str__ = Enum.__str__
+
+@dataclass(slots=True)
 class Schedule:
     """ A schedule for (repeating) radio events.
     """
@@ -49,6 +55,19 @@ class Schedule:
     # the schedule describes a transmission event. Optional, doesn't need
     # to be specified if the schedule describes a receive event.
     packet_constructor : Optional[Callable[[], DataPacket]] = None
+    # State of the schedule; set upon construction
+    state    : ScheduleState = field(init=False)
+    # Schedule counter; schedule repeats `num` times, and this tracks how
+    # many times the schedule has thus far been active.
+    _current : int = field(init=False, repr=False)
+    # Schedule manager the schedule was added to; None until it's added to one
+    _owner   : Optional["ScheduleManager"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Invoked to produce the return value of each schedule event
+    _produce : Callable[[], Optional[Union[DataPacket, "Schedule"]]] = field(
+        init=False, repr=False, compare=False
+    )
     
     def __post_init__(self):
         """ Post-construction method to perform checks and setup internal state.
@@ -64,9 +83,15 @@ class Schedule:
             )
 
         self.state = ScheduleState.ACTIVE
-        # Schedule counter; schedule repeats `num` times, and this tracks how
-        # many times the schedule has thus far been active.
         self._current = 0
+        # The mode doesn't change over the schedule's lifetime, so bind what each
+        # schedule event produces once rather than checking the mode per event
+        if self.mode == RadioMode.TX:
+            self._produce = self.packet_constructor
+        elif self.mode == RadioMode.RX:
+            self._produce = lambda: self
+        else:
+            self._produce = lambda: None
         
     def next_time(self) -> int:
         """ Compute the simulation time at which the next schedule event is to take place.
@@ -81,30 +106,23 @@ class Schedule:
         else:
             raise RuntimeError("Schedule has expired -- shouldn't be querying next_time().")
 
-    def event(self) -> Union[DataPacket, "Schedule"]:
+    def next_event(self) -> Optional[Union[DataPacket, "Schedule"]]:
         """ Retrieve the data required for either transmission or receiving
         and increment the schedule counter.
 
-        Note that this is a generator, and the caller should use next() when
-        calling.
-
         Returns
         -------
-            Union[DataPacket, Schedule]
+            Optional[Union[DataPacket, Schedule]]
                 If the schedule is for transmission, will return the data packet to transmit.
                 If the schedule is for receiving, will return this schedule so that receive
                 duration can be retrieved by the radio.
         """
-        return_val = None
-        while self._current < self.num:
-            self._current += 1
+        if self._current >= self.num:
+            raise RuntimeError("Schedule has expired -- shouldn't be querying next_event().")
 
-            if self.mode == RadioMode.TX:
-                return_val = self.packet_constructor()
-            elif self.mode == RadioMode.RX:
-                return_val = self
+        self._current += 1
+        return_val = self._produce()
+        if self._current == self.num:
+            self.state = ScheduleState.COMPLETE
+        return return_val
 
-            if self._current == self.num:
-                self.state = ScheduleState.COMPLETE
-            yield return_val
-                
@@ -1,9 +1,12 @@
 ###
 ### Python standard dependencies
 ###
+import heapq
+import inspect
 import logging
+import itertools
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Iterable, List, Optional, Tuple
 ###
 ### Third-party dependencies
 ###
@@ -21,7 +24,13 @@ class ScheduleManager:
     """ Communication schedule management.
     """
 
-    @dataclass
+    __slots__ = (
+        "_env", "_logger", "_transmit_cb", "_receive_cb", "_handle_packet_cb",
+        "_schedules", "_seq", "_cancelled_count", "_starts", "_stops", "_modes",
+        "_awaiting_schedules", "_dispatch", "_manager_proc"
+    )
+
+    @dataclass(slots=True)
     class ScheduleEvent:
         """ Logging event, keeping track of when schedule events take place.
         """
@@ -35,7 +44,7 @@ class ScheduleManager:
 
     def __init__(
         self, env : simpy.Environment,
-        transmit_cb : Callable[[int, DataPacket], None],
+        transmit_cb : Callable[[int, DataPacket], simpy.Event],
         receive_cb : Callable[[int], Optional[DataPacket]],
         handle_packet_cb : Callable[[Optional[DataPacket]], None]
     ):
@@ -47,8 +56,11 @@ class ScheduleManager:
                 The simpy environment.
             transmit_cb :
                 Callback function which takes a data packet and the duration of
-                the scheduled transmit period. As designed, this should be the
-                radio's transmit function.
+                the scheduled transmit period, and begins transmitting without
+                needing to be run as a process. As designed, this should be the
+                radio's start_transmit function; generator functions such as the
+                radio's transmit function are rejected, since they'd need running as
+                a process.
             receive_cb :
                 Callback function which takes the duration of the scheduled receive
                 period and optionally returns a data packet if one was received
@@ -58,6 +70,11 @@ class ScheduleManager:
                 Callback function which takes the received packet and enacts some
                 protocol-specific action to handle the packet.
         """
+        if inspect.isgeneratorfunction(transmit_cb):
+            raise RuntimeError(
+                "ScheduleManager transmit callback must begin transmitting when " +
+                "called, not be a generator function; use Radio.start_transmit."
+            )
         self._env = env
         self._logger = logging.getLogger("ScheduleManager")
 
@@ -65,10 +82,28 @@ class ScheduleManager:
         self._receive_cb = receive_cb
         self._handle_packet_cb = handle_packet_cb
         
+        # Min-heap of (next time, sequence number, schedule) entries; the sequence
+        # number breaks ties between schedules triggering at the same time in the
+        # order they were added, so schedules themselves are never compared
         self._schedules = []
-        self._event_log = []
+        self._seq = itertools.count()
+        # Cancelled schedules are left in the heap and discarded once they reach
+        # its head; this counts how many of them the heap currently holds
+        self._cancelled_count = 0
+        # Log of every schedule event added to the manager, held as parallel
+        # arrays of start times, stop times and radio modes
+        self._starts = np.empty(0, dtype=np.int64)
+        self._stops = np.empty(0, dtype=np.int64)
+        self._modes = np.empty(0, dtype=np.int8)
         self._awaiting_schedules = SharedEvent(env=self._env)
         
+        # Mapping from schedule mode -> method enacting an event of that mode, which
+        # returns an event for the manager to wait on, if there is one
+        self._dispatch = {
+            RadioMode.TX : self._do_tx,
+            RadioMode.RX : self._do_rx
+        }
+        
         self._manager_proc = self._env.process(self.run())
         
     def add(self, schedule : Schedule) -> bool:
@@ -87,41 +122,218 @@ class ScheduleManager:
             bool
                 True if the schedule was successfully added, else false.
         """
-        was_awaiting_schedules = False
-        if self._schedules == []:
-            was_awaiting_schedules = True
-
-        self._schedules.append(schedule)
-        # Need to interrupt the manager process in case the schedule we've added will
-        # trigger during any timeouts that the manager process is currently waiting
-        # on because the other schedules will trigger later
-        self._manager_proc.interrupt()
+        next_time = schedule.next_time()
+        schedule._owner = self
+        # Need to wake the manager process in case it's waiting for schedules, or
+        # in case the schedule we've added will trigger during the timeout that the
+        # manager process is currently waiting on because the other schedules will
+        # trigger later. If the schedule doesn't trigger before the head of the
+        # heap, the manager will get to it anyway
+        wake_manager = not self._schedules or next_time < self._schedules[0][0]
+        heapq.heappush(self._schedules, (next_time, next(self._seq), schedule))
         
-        self._event_log += [
-            self.ScheduleEvent(
-                start=start, stop=start + schedule.duration, mode=schedule.mode
-            )
-            for start in np.arange(0, schedule.num) * schedule.delay + schedule.start
-        ]
+        self._log_events((schedule,))
         
-        if was_awaiting_schedules:
+        if wake_manager:
             self._awaiting_schedules.reactivate()
-        self._logger.debug(f"Schedule was added at time {self._env.now}")
-        self._logger.debug(f"{schedule}")
-        self._logger.debug(f"{len(self._schedules)} schedule/s are now active")
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Schedule was added at time %s", self._env.now)
+            self._logger.debug("%s", schedule)
+            self._logger.debug("%s schedule/s are now active", len(self._schedules))
 
         return True
+
+    def add_many(self, schedules : Iterable[Schedule]) -> bool:
+        """ Add several schedules to the manager at once.
+
+        The heap is rebuilt once with all of the schedules, rather than each
+        schedule being pushed onto it in turn.
+
+        Parameters
+        ----------
+            schedules :
+                The schedules to try and add.
+
+        Returns
+        -------
+            bool
+                True if the schedules were successfully added, else false.
+        """
+        entries = [
+            (schedule.next_time(), next(self._seq), schedule) for schedule in schedules
+        ]
+        if not entries:
+            return True
+        for _, _, schedule in entries:
+            schedule._owner = self
+
+        # Need to wake the manager process for the same reasons as when adding a
+        # single schedule; only the earliest of the new schedules matters
+        wake_manager = \
+            not self._schedules or min(entries)[0] < self._schedules[0][0]
+        self._schedules.extend(entries)
+        heapq.heapify(self._schedules)
+
+        self._log_events([schedule for _, _, schedule in entries])
+
+        if wake_manager:
+            self._awaiting_schedules.reactivate()
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(
+                "%s schedules were added at time %s", len(entries), self._env.now
+            )
+            for _, _, schedule in entries:
+                self._logger.debug("%s", schedule)
+            self._logger.debug("%s schedule/s are now active", len(self._schedules))
+
+        return True
+
+    def _log_events(self, schedules : Iterable[Schedule]):
+        """ Append every event of the given schedules to the schedule event log.
+
+        Parameters
+        ----------
+            schedules :
+                The schedules whose events are logged.
+        """
+        starts = []
+        stops = []
+        modes = []
+        for schedule in schedules:
+            # Simulation times needn't be integral, so the start times take whatever
+            # type the schedule's start and delay need
+            schedule_starts = np.arange(
+                schedule.num, dtype=np.result_type(schedule.start, schedule.delay)
+            )
+            schedule_starts *= schedule.delay
+            schedule_starts += schedule.start
+            starts.append(schedule_starts)
+            stops.append(schedule_starts + schedule.duration)
+            modes.append(np.full(schedule.num, schedule.mode, dtype=np.int8))
+        self._starts = np.concatenate([self._starts] + starts)
+        self._stops = np.concatenate([self._stops] + stops)
+        self._modes = np.concatenate([self._modes] + modes)
+
+    def schedule_events(self) -> List["ScheduleManager.ScheduleEvent"]:
+        """ Getter for the log of schedule events added to the manager.
+
+        Returns
+        -------
+            List[ScheduleManager.ScheduleEvent]
+                Every schedule event, in the order their schedules were added.
+        """
+        return [
+            self.ScheduleEvent(start=start, stop=stop, mode=RadioMode(mode))
+            for start, stop, mode in zip(
+                self._starts.tolist(), self._stops.tolist(), self._modes.tolist()
+            )
+        ]
+
+    def cancel(self, schedule : Schedule) -> bool:
+        """ Cancel a schedule that was added to the manager, so that none of its
+        remaining events are enacted.
+
+        Parameters
+        ----------
+            schedule :
+                The schedule to cancel.
+
+        Returns
+        -------
+            bool
+                True if the schedule was cancelled, else false if it wasn't added
+                to this manager, or had already completed or been cancelled.
+        """
+        if schedule._owner is not self or \
+           schedule.state in (ScheduleState.COMPLETE, ScheduleState.CANCELLED):
+            return False
+
+        # Rather than searching the heap for the schedule, flag it so that it's
+        # discarded when it reaches the head of the heap
+        schedule.state = ScheduleState.CANCELLED
+        self._cancelled_count += 1
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Schedule was cancelled at time %s", self._env.now)
+            self._logger.debug("%s", schedule)
+
+        return True
+
+    def _discard_cancelled(self):
+        """ Remove cancelled schedules from the head of the heap, and rebuild the
+        heap without any cancelled schedules once they make up most of it.
+        """
+        while self._schedules and \
+              self._schedules[0][2].state == ScheduleState.CANCELLED:
+            heapq.heappop(self._schedules)
+            self._cancelled_count -= 1
+
+        if len(self._schedules) > 16 and \
+           self._cancelled_count > len(self._schedules) / 2:
+            self._schedules = [
+                entry for entry in self._schedules
+                if entry[2].state != ScheduleState.CANCELLED
+            ]
+            heapq.heapify(self._schedules)
+            self._cancelled_count = 0
         
-    def _next_active_schedule(self) -> Optional[Schedule]:
+    def _next_active_schedule(self) -> Optional[Tuple[int, Schedule]]:
         """ Query which schedule is going to trigger an event next.
 
         Returns
         -------
-            Schedule which triggers next if there is one, else None.
+            Optional[Tuple[int, Schedule]]
+                Schedule which triggers next, and the simulation time at which it
+                triggers, if there is one, else None.
         """
-        if self._schedules == []:
+        if not self._schedules:
             return None
-        return min(self._schedules, key=lambda x : x.next_time())
+        next_time, _, next_schedule = self._schedules[0]
+        return next_time, next_schedule
+
+    def _do_tx(self, schedule : Schedule) -> None:
+        """ Enact a transmit schedule event; transmission completes by itself, so
+        the manager doesn't wait for it to complete.
+
+        Parameters
+        ----------
+            schedule :
+                The schedule whose event is being enacted.
+
+        Returns
+        -------
+            None
+                There's nothing for the manager to wait on.
+        """
+        self._transmit_cb(schedule.duration, schedule.next_event())
+
+    def _do_rx(self, schedule : Schedule) -> simpy.Event:
+        """ Enact a receive schedule event; the radio receives for the scheduled
+        duration, and whatever it received is handled once it's done.
+
+        Parameters
+        ----------
+            schedule :
+                The schedule whose event is being enacted.
+
+        Returns
+        -------
+            simpy.Event
+                Event which is processed once the received packet has been handled.
+        """
+        def handle_packet(event : simpy.Event):
+            """ Handle whatever the radio received.
+
+            Parameters
+            ----------
+                event :
+                    The receive process, whose value is the received packet.
+            """
+            if event.ok:
+                self._handle_packet_cb(event.value)
+
+        rx_proc = self._env.process(self._receive_cb(schedule.next_event().duration))
+        rx_proc.callbacks.append(handle_packet)
+        return rx_proc
 
     def run(self):
         """ Process which waits for the next schedule to trigger, then configures
@@ -130,34 +342,54 @@ class ScheduleManager:
         Will invoke the various callbacks that the ScheduleManager has been
         parameterised with for transmitting, receiving and handling packets.
         """
+        # Bind everything the loop uses on every iteration to locals
+        env = self._env
+        timeout = env.timeout
+        any_of = env.any_of
+        dispatch = self._dispatch
+        seq = self._seq
         while True:
-            if self._schedules == []:
+            self._discard_cancelled()
+            if not self._schedules:
                 yield self._awaiting_schedules.event
 
             # Wait till the next schdeule becomes active
-            # Note that this can be interrupted in the case that the Schedule
-            # list is manipulated somehow, e.g. addition of a schedule
-            next_schedule = self._next_active_schedule()
-            try:
-                yield self._env.timeout(next_schedule.next_time() - self._env.now)
-            except simpy.Interrupt as interrupt:
-                self._logger.debug("Manager run process was interrupted.")
-                continue
+            # Note that this wait ends early if a schedule is added that triggers
+            # before it, in which case we go round again for the new schedule
+            # The schedule's next time is held as its key in the heap, and is only
+            # recomputed when the schedule is returned to the heap
+            next_time, next_schedule = self._next_active_schedule()
+            yield any_of((timeout(next_time - env.now), self._awaiting_schedules.event))
 
-            # If we didn't prematurely interrupt the timeout till the next
-            # schedule becomes active, then execute the asssociated event
-            if next_schedule.next_time() == self._env.now:
-                if next_schedule.mode == RadioMode.TX:
-                    self._env.process(
-                        self._transmit_cb(next_schedule.duration, next(next_schedule.event()))
-                    )
-                elif next_schedule.mode == RadioMode.RX:
-                    rx_packet_event = yield self._env.process(
-                        self._receive_cb(next(next_schedule.event()).duration)
-                    )
-                    self._handle_packet_cb(rx_packet_event)
+            # If the wait didn't end early, execute the asssociated event once
+            # the schedule becomes active
+            if next_schedule.state == ScheduleState.CANCELLED:
+                continue
+            if next_time == env.now:
+                # The schedule at the head of the heap is the one we've waited on;
+                # take it off while it's enacted since its next time will change
+                heapq.heappop(self._schedules)
+                # Handlers return an event to wait on only if the manager has to
+                # wait for the schedule event to complete. Events of modes without
+                # a handler are consumed without doing anything, so the schedule
+                # still advances
+                handler = dispatch.get(next_schedule.mode)
+                if handler is not None:
+                    wait_event = handler(next_schedule)
+                    if wait_event is not None:
+                        yield wait_event
+                else:
+                    next_schedule.next_event()
                 
-                # Schedule has been enacted; process list of schedules
-                if next_schedule.state == ScheduleState.COMPLETE:
-                    self._schedules.remove(next_schedule)
+                # Schedule has been enacted; return it to the heap at its next time
+                # unless it has no events remaining. If it was cancelled while
+                # being enacted, it was never in the heap to be discarded
+                state = next_schedule.state
+                if state == ScheduleState.CANCELLED:
+                    self._cancelled_count -= 1
+                elif state != ScheduleState.COMPLETE:
+                    heapq.heappush(
+                        self._schedules,
+                        (next_schedule.next_time(), next(seq), next_schedule)
+                    )
 
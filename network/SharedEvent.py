@@ -34,7 +34,22 @@ class SharedEvent:
                 Simpy environment from which we'll create Events.
         """
         self._env = env
-        self.event = self._env.event()
+        # The held event is only created once something asks for it, so that
+        # reactivating without anything waiting doesn't create a new event
+        self._event = None
+
+    @property
+    def event(self) -> simpy.Event:
+        """ Getter for the held event, creating it if there isn't one.
+
+        Returns
+        -------
+            simpy.Event
+                The held event.
+        """
+        if self._event is None:
+            self._event = self._env.event()
+        return self._event
 
     def reactivate(self, value : Optional[Any] = None):
         """ Reactivate pattern for the held event.
@@ -48,5 +63,7 @@ class SharedEvent:
                 Optional value we can pass to the object waiting on the
                 event.
         """
-        self.event.succeed(value=value)
-        self.event = self._env.event()
+        # If the event was never created, nothing can be waiting on it
+        if self._event is not None:
+            self._event.succeed(value=value)
+            self._event = None
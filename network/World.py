@@ -2,10 +2,10 @@
 ### Python standard dependencies
 ###
 from enum import Enum
+import bisect
 import logging
-from typing import Iterable
+from typing import Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
-from collections import deque
 ###
 ### Third-party dependencies
 ###
@@ -16,12 +16,150 @@ import simpy
 from .Node import Node
 from .Radio import RadioMode, RadioPacket, Radio
 
+class CollisionEventHistory:
+    """ Circular buffer of collision events.
+
+    Each collision is held as a (time, packet_a, packet_b) tuple; the CollisionEvent
+    for an entry is only constructed when that entry is retrieved. The collision
+    times are also held in a list of their own, so that intervals of time can be
+    found by bisection.
+    """
+
+    def __init__(self, maxlen : Optional[int] = None):
+        """ Class constructor.
+
+        Parameters
+        ----------
+            maxlen :
+                Maximum number of collisions held; once full, the oldest collision
+                is discarded. Optional; if not specified, every collision is held.
+        """
+        self._maxlen = maxlen
+        # Entries and their times, parallel to one another. Discarded entries are
+        # left at the front of both lists until enough build up to be worth
+        # removing all at once, so that discarding is amortised constant time
+        self._entries = []
+        self._times = []
+        # Index of the oldest entry held
+        self._first = 0
+
+    def __len__(self) -> int:
+        """ Number of collision events held.
+
+        Returns
+        -------
+            int
+                The number of collision events.
+        """
+        return len(self._entries) - self._first
+
+    def __getitem__(self, idx : int) -> "World.CollisionEvent":
+        """ Retrieve a collision event, where events are indexed from oldest to newest.
+
+        Parameters
+        ----------
+            idx :
+                Index of the event; negative indices count back from the newest.
+
+        Returns
+        -------
+            World.CollisionEvent
+                The collision event.
+        """
+        num_entries = len(self)
+        if idx < 0:
+            idx += num_entries
+        if not 0 <= idx < num_entries:
+            raise IndexError("CollisionEventHistory index out of range.")
+        return self._make_event(self._entries[self._first + idx])
+
+    def __iter__(self) -> Iterator["World.CollisionEvent"]:
+        """ Iterate over the collision events from oldest to newest.
+
+        Returns
+        -------
+            Iterator[World.CollisionEvent]
+                Iterator over the collision events.
+        """
+        for idx in range(self._first, len(self._entries)):
+            yield self._make_event(self._entries[idx])
+
+    @staticmethod
+    def _make_event(entry : Tuple[float, RadioPacket, RadioPacket]) -> "World.CollisionEvent":
+        """ Construct the collision event for an entry.
+
+        Parameters
+        ----------
+            entry :
+                The (time, packet_a, packet_b) entry.
+
+        Returns
+        -------
+            World.CollisionEvent
+                The collision event.
+        """
+        time, packet_a, packet_b = entry
+        return World.CollisionEvent(
+            status=World.CollisionEvent.Status.COLLISION,
+            time=time, packet_a=packet_a, packet_b=packet_b
+        )
+
+    def append(self, time : float, packet_a : RadioPacket, packet_b : RadioPacket):
+        """ Record a collision, discarding the oldest collision if the buffer is full.
+
+        Parameters
+        ----------
+            time :
+                The time at which the packets collide.
+            packet_a :
+                First packet being delivered.
+            packet_b :
+                Second packet being delivered.
+        """
+        self._entries.append((time, packet_a, packet_b))
+        self._times.append(time)
+        if self._maxlen is not None and len(self) > self._maxlen:
+            self._first += 1
+            if self._first >= self._maxlen:
+                del self._entries[:self._first]
+                del self._times[:self._first]
+                self._first = 0
+
+    def clear(self):
+        """ Discard every collision event.
+        """
+        self._entries.clear()
+        self._times.clear()
+        self._first = 0
+
+    def between(self, start_time : float, stop_time : float) -> List["World.CollisionEvent"]:
+        """ Retrieve the collision events that took place over an interval.
+
+        Collisions are appended as they happen, so their times are ordered and the
+        interval can be found by bisection.
+
+        Parameters
+        ----------
+            start_time :
+                Simulation time at which the interval begins, inclusive.
+            stop_time :
+                Simulation time at which the interval ends, inclusive.
+
+        Returns
+        -------
+            List[World.CollisionEvent]
+                The collision events within the interval, from oldest to newest.
+        """
+        lo = bisect.bisect_left(self._times, start_time, lo=self._first)
+        hi = bisect.bisect_right(self._times, stop_time, lo=lo)
+        return [self._make_event(entry) for entry in self._entries[lo:hi]]
+
 class World:
     """ Environment in which nodes exist; includes features such as physical
     obstacles that may impact wireless communications and movement.
     """
     
-    @dataclass
+    @dataclass(slots=True)
     class CollisionEvent:
         """ Logging event, keeping track of the time at which a collision between
         packets on-air takes place
@@ -36,7 +174,7 @@ class World:
         # Status of the collision event
         status : Status
         # The time at which the packets collide
-        time : int
+        time : float
         # First packet being delivered
         packet_a : RadioPacket
         # Second packet being delivered
@@ -66,14 +204,15 @@ class World:
                 bool
                     True if the collision events are equal, otherwise false.
             """
+            if not isinstance(other, World.CollisionEvent):
+                return NotImplemented
             # God only knows what order the packets get assigned in, so check
-            # both permutations
-            return \
-                (self.time == other.time)          and \
-                ((self.packet_a == other.packet_a) and \
-                (self.packet_b == other.packet_b)) or  \
-                ((self.packet_a == other.packet_b) and \
-                self.packet_b == other.packet_a)
+            # both permutations; the times must match for either
+            packets = (self.packet_a, self.packet_b)
+            return self.time == other.time and (
+                packets == (other.packet_a, other.packet_b) or
+                packets == (other.packet_b, other.packet_a)
+            )
         
     def __init__(self, env : simpy.Environment, nodes : Iterable[Node]):
         """ Class constructor.
@@ -91,58 +230,103 @@ class World:
         for node in nodes:
             self._nodes[node._name] = node
 
+        # Every radio transmits onto the same queue, so the world only has to wait
+        # on a single queue however many nodes there are. Unlike an event, packets
+        # transmitted within the same timestep queue up rather than being lost
+        self._transmit_queue = simpy.Store(self._env)
+        for node in self._nodes.values():
+            node._radio._transmit_queue = self._transmit_queue
+        # Mappings from node name -> radios that receive a packet addressed to that
+        # node, and radios that receive a broadcast from that node. The nodes in the
+        # world don't change, so these are built once up front
+        self._unicast_targets = {
+            name : (node._radio,) for name, node in self._nodes.items()
+        }
+        self._broadcast_targets = {
+            src : tuple(node._radio for name, node in self._nodes.items() if name != src)
+            for src in self._nodes
+        }
+
         self._comms_proc = self._env.process(self.communications())
         self._logger = logging.getLogger("World")
 
         # Circular buffer holding events where packets collide
-        self._collision_packet_history = deque(maxlen=100)
+        self._collision_packet_history = CollisionEventHistory(maxlen=100)
         
+    def get_collisions_at(self, time : float) -> List["World.CollisionEvent"]:
+        """ Retrieve the collision events that took place at a given time.
+
+        Parameters
+        ----------
+            time :
+                Simulation time of the collisions.
+
+        Returns
+        -------
+            List[World.CollisionEvent]
+                The collision events at that time.
+        """
+        return self._collision_packet_history.between(time, time)
+
+    def get_collisions_between(
+        self, start_time : float, stop_time : float
+    ) -> List["World.CollisionEvent"]:
+        """ Retrieve the collision events that took place over an interval.
+
+        Parameters
+        ----------
+            start_time :
+                Simulation time at which the interval begins, inclusive.
+            stop_time :
+                Simulation time at which the interval ends, inclusive.
+
+        Returns
+        -------
+            List[World.CollisionEvent]
+                The collision events within the interval, from oldest to newest.
+        """
+        return self._collision_packet_history.between(start_time, stop_time)
+
     def communications(self):
         """ Run the communications process, routing transmitted messages between
         nodes.
         """
         while True:
-            # Wait for any Node to try and transmit a packet
-            tx_events = [node._radio._transmit_event.event for node in self._nodes.values()]
-            tx_packets = yield self._env.any_of(tx_events)
-
-            # For each Node trying to transmit a packet this timestep, route the packet
-            for tx_packet in [packet.value for packet in tx_packets]:
-
-                ## TODO : RSSI calculation
-
-                # Work out which Nodes we need to route the packet to; need to check whether
-                # it's a broadcast packet or not, and remove the transmitting Node from the
-                # recipient list if so
-                rx_nodes = []
-                if tx_packet.dest() == "All":
-                    rx_nodes = self._nodes.copy()
-                    del rx_nodes[tx_packet.src()]
-                    rx_nodes = list(rx_nodes.values())
-                else:
-                    rx_nodes = [self._nodes[tx_packet.dest()]]
-
-                names = [node._name for node in rx_nodes]
-                # Deliver the packet to the destination Nodes so long as the destination
-                # node radios are capable of receiving the packet that's being routed
-                for rx_node in rx_nodes:
-                    if rx_node._radio.notify_intent_to_deliver(tx_packet):
-                        pending_rx = rx_node._radio._pending_rx
-                        # If the receiving Node isn't currently in the process of
-                        # receiving an earlier packet, start receiving
-                        if pending_rx == None or pending_rx.is_alive == False:
-                            rx_node._radio._pending_rx = self._env.process(
-                                self.pending_transmit(rx_node._radio, tx_packet)
-                            )
-                        # Otherwise if the receiving Node is in the process of receiving
-                        # an earlier packet, interrupt that receive process and ascertain
-                        # whether this new packet interferes with the receiving of the
-                        # earlier packet
+            # Wait for any Node to try and transmit a packet, and route the packet.
+            # Packets are taken off the queue one at a time, so Nodes transmitting
+            # in the same timestep are routed in the order they transmitted
+            tx_packet = yield self._transmit_queue.get()
+
+            ## TODO : RSSI calculation
+
+            # Work out which Nodes we need to route the packet to; need to check whether
+            # it's a broadcast packet or not, in which case every Node other than the
+            # transmitting Node receives it
+            if tx_packet.dest() == "All":
+                rx_radios = self._broadcast_targets[tx_packet.src()]
+            else:
+                rx_radios = self._unicast_targets[tx_packet.dest()]
+
+            # Deliver the packet to the destination Nodes so long as the destination
+            # node radios are capable of receiving the packet that's being routed
+            for rx_radio in rx_radios:
+                if rx_radio.notify_intent_to_deliver(tx_packet):
+                    pending_rx = rx_radio._pending_rx
+                    # If the receiving Node isn't currently in the process of
+                    # receiving an earlier packet, start receiving
+                    if pending_rx == None or pending_rx.is_alive == False:
+                        rx_radio._pending_rx = self._env.process(
+                            self.pending_transmit(rx_radio, tx_packet)
+                        )
+                    # Otherwise if the receiving Node is in the process of receiving
+                    # an earlier packet, interrupt that receive process and ascertain
+                    # whether this new packet interferes with the receiving of the
+                    # earlier packet
+                    else:
+                        if (pending_rx is not None) or pending_rx.is_alive == True:
+                            pending_rx.interrupt(tx_packet)
                         else:
-                            if (pending_rx is not None) or pending_rx.is_alive == True:
-                                pending_rx.interrupt(tx_packet)
-                            else:
-                                self._logger.warning("Unrecognised error when routing.")
+                            self._logger.warning("Unrecognised error when routing.")
 
     def pending_transmit(self, radio : Radio, packet : RadioPacket):
         """ Timeout for the duration of a radio packet.
@@ -157,6 +341,7 @@ class World:
             packet :
                 The packet that we're trying to deliver.
         """        
+        debug = self._logger.isEnabledFor(logging.DEBUG)
         start_time = self._env.now
         end_time = start_time + packet.duration
         collision = False
@@ -172,18 +357,17 @@ class World:
             #        else currently being received
             except simpy.Interrupt as interrupt:
                 interrupting_packet = interrupt.cause
-                if type(interrupting_packet) is RadioPacket:
-                    self._logger.debug(
-                        f"{interrupting_packet.data_packet} collides with {packet.data_packet}"
-                    )
+                if isinstance(interrupting_packet, RadioPacket):
                     self._collision_packet_history.append(
-                        self.CollisionEvent(
-                            status=self.CollisionEvent.Status.COLLISION,
-                            time=self._env.now, packet_a=interrupting_packet, packet_b=packet
-                        )
+                        self._env.now, interrupting_packet, packet
                     )
-                elif type(interrupting_packet) is str:
-                    self._logger.debug(f"Interrupted: {interrupting_packet}")
+                    if debug:
+                        self._logger.debug(
+                            "%s collides with %s",
+                            interrupting_packet.data_packet, packet.data_packet
+                        )
+                elif debug:
+                    self._logger.debug("Interrupted: %s", interrupting_packet)
                 # Don't want to return yet because we want to mop up any other
                 # packets that might collide with this one; just flag that
                 # RX won't be successful
@@ -3,7 +3,7 @@
 ###
 import logging
 import unittest
-from typing import Iterable
+from typing import Iterable, NamedTuple, Optional, Tuple
 ###
 ### Third-party dependencies
 ###
@@ -13,34 +13,150 @@ import simpy
 ###
 from network.Logger import initialise_sim_logger
 from network.Packet import DataPacket
-from network.Radio import RadioPacket
+from network.Radio import RadioPacket, RadioEventRing
 from network.Protocol import Protocol
 from network.Node import Node
-from network.World import World
+from network.World import World, CollisionEventHistory
 from network.Radio import Radio
 from network.Plotter import packet_routing
 
+# Silence matplotlib's logging once for the whole module, rather than for every test
+logging.getLogger("matplotlib").setLevel(logging.CRITICAL)
+
+# Duration of every packet transmitted
+DURATION = 5
+# Receive windows outlast the packet duration slightly so that packets ending when
+# the window would otherwise end are still received
+RX_WINDOW = DURATION + 1E-3
+
+class Scenario(NamedTuple):
+    """ A communication scenario in which every node's radio action starts at the
+    same time, along with the radio events each node is expected to log.
+    """
+
+    # Name of the scenario
+    name : str
+    # The radio actions taking place; either ("rx", node index, duration) or
+    # ("tx", node index, duration, packet key)
+    actions : Tuple[Tuple, ...]
+    # Number of TX events expected for each node
+    tx_events : Tuple[int, ...]
+    # Number of RX events expected for each node
+    rx_events : Tuple[int, ...]
+    # The radio events expected, each as (node index, "tx" or "rx" history, index of
+    # the event in the history, packet key or None if no packet, event status)
+    expected_events : Tuple[Tuple, ...]
+    # RSSI threshold of every radio during the scenario. Optional; if not specified,
+    # the radios keep their default threshold
+    threshold_rssi : Optional[float] = None
+
+# Scenarios which are verified only by the radio events the nodes log
+SCENARIOS = (
+    # Sending a packet from one node to another
+    #     0          5
+    # A : +--- RX ---+
+    # B : +== TX A ==+
+    # C :
+    Scenario(
+        name="unicast",
+        actions=(("rx", 0, RX_WINDOW), ("tx", 1, DURATION, "B->A")),
+        tx_events=(0,1,0), rx_events=(1,0,0),
+        expected_events=(
+            (0, "rx", 0, "B->A", Radio.RadioEvent.Status.SUCCESS_RX),
+            (1, "tx", 0, "B->A", Radio.RadioEvent.Status.SUCCESS_TX)
+        )
+    ),
+    # Broadcasting a packet from one node to all others
+    #     0          5
+    # A : +--- RX ---+
+    # B : +--- RX ---+
+    # C : += TX ALL =+
+    Scenario(
+        name="broadcast",
+        actions=(("rx", 0, RX_WINDOW), ("rx", 1, RX_WINDOW), ("tx", 2, DURATION, "C->X")),
+        tx_events=(0,0,1), rx_events=(1,1,0),
+        expected_events=(
+            (0, "rx", 0, "C->X", Radio.RadioEvent.Status.SUCCESS_RX),
+            (1, "rx", 0, "C->X", Radio.RadioEvent.Status.SUCCESS_RX),
+            (2, "tx", 0, "C->X", Radio.RadioEvent.Status.SUCCESS_TX)
+        )
+    ),
+    # Listening for a packet without anything transmitting
+    #     0          5
+    # A : +--- RX ---+
+    # B :
+    # C : +--- RX ---+
+    Scenario(
+        name="listening",
+        actions=(("rx", 0, DURATION), ("rx", 2, DURATION)),
+        tx_events=(0,0,0), rx_events=(1,0,1),
+        expected_events=(
+            (0, "rx", 0, None, Radio.RadioEvent.Status.NOTHING_RX),
+            (2, "rx", 0, None, Radio.RadioEvent.Status.NOTHING_RX)
+        )
+    ),
+    # Transmitting a packet without anything listening
+    #     0          5
+    # A : +== TX B ==+
+    # B :
+    # C : +== TX A ==+
+    Scenario(
+        name="not_listening",
+        actions=(("tx", 0, DURATION, "A->B"), ("tx", 2, DURATION, "C->A")),
+        tx_events=(1,0,1), rx_events=(1,1,0),
+        expected_events=(
+            (0, "rx", 0, "C->A", Radio.RadioEvent.Status.DROPPED_MODE),
+            (1, "rx", 0, "A->B", Radio.RadioEvent.Status.DROPPED_MODE),
+            (0, "tx", 0, "A->B", Radio.RadioEvent.Status.SUCCESS_TX),
+            (2, "tx", 0, "C->A", Radio.RadioEvent.Status.SUCCESS_TX)
+        )
+    ),
+    # Transmitting a packet whose signal strength is lower than the threshold of
+    # the receiving node's radio
+    #     0          5
+    # A : +--- RX ---+
+    # B :
+    # C : +== TX A ==+
+    Scenario(
+        name="rssi",
+        actions=(("rx", 0, RX_WINDOW), ("tx", 2, DURATION, "C->A")),
+        tx_events=(0,0,1), rx_events=(2,0,0),
+        expected_events=(
+            (0, "rx", 0, "C->A", Radio.RadioEvent.Status.DROPPED_RSSI),
+            (0, "rx", 1, None, Radio.RadioEvent.Status.NOTHING_RX),
+            (2, "tx", 0, "C->A", Radio.RadioEvent.Status.SUCCESS_TX)
+        ),
+        threshold_rssi=2.0
+    ),
+)
+
 class TestCommunications(unittest.TestCase):
     """ Test basic communications between nodes functions as expected.
+
+    The simpy environment, world and nodes are built once and shared by every test,
+    each test running its communications from wherever the environment's time got
+    to; the record of earlier tests' communications is cleared before each test, so
+    the tests can still be run in any order.
     """
     
-    def __init__(self, *args, **kwargs):
-        """ Class constructor.
+    @classmethod
+    def setUpClass(cls):
+        """ Setup the logger, simpy environment, world and nodes, along with the packets
+        used throughout.
         """
-        super(TestCommunications, self).__init__(*args, **kwargs)
-        self.env = simpy.Environment()
-        initialise_sim_logger(self.env, logging.INFO)
-        logging.getLogger("matplotlib").setLevel(logging.CRITICAL)
+        cls.env = simpy.Environment()
+        initialise_sim_logger(cls.env, logging.INFO)
         
-        self.nodes = [
-            Node(self.env, "A"),
-            Node(self.env, "B"),
-            Node(self.env, "C")
+        cls.nodes = [
+            Node(cls.env, "A"),
+            Node(cls.env, "B"),
+            Node(cls.env, "C")
         ]
-        self.world = World(self.env, self.nodes)
-        
-        self.duration = 5
-        self.packets = {
+        cls.world = World(cls.env, cls.nodes)
+        # Tests may change the threshold, so keep hold of the radios' default
+        cls.threshold_rssi = cls.nodes[0]._radio._threshold_rssi
+
+        cls.packets = {
             "A->B" : DataPacket(src="A", dest="B", contents="Hello from A!"),
             "A->C" : DataPacket(src="A", dest="C", contents="Hello from A!"),
             "B->A" : DataPacket(src="B", dest="A", contents="Hello from B!"),
@@ -52,6 +168,30 @@ class TestCommunications(unittest.TestCase):
             "C->X" : DataPacket(src="C", dest="All", contents="Hello from C!"),
         }
 
+    def setUp(self):
+        """ Clear the record of any earlier test's communications, and restore any
+        radio parameters an earlier test may have changed.
+        """
+        self._reset()
+
+    def _reset(self):
+        """ Clear the record of any earlier communications, and restore any radio
+        parameters that may have been changed.
+        """
+        # Tests only run the environment until their own process completes. Anything
+        # their communications started has finished by then, though events may still
+        # be queued for that same time, so process only those before clearing the
+        # records rather than running the environment to exhaustion
+        while self.env.peek() <= self.env.now:
+            self.env.step()
+        for node in self.nodes:
+            radio = node._radio
+            capacity = radio._tx_packet_history.capacity
+            radio._tx_packet_history = RadioEventRing(capacity=capacity)
+            radio._rx_packet_history = RadioEventRing(capacity=capacity)
+            radio._threshold_rssi = self.threshold_rssi
+        self.world._collision_packet_history.clear()
+
     @staticmethod
     def verify_radio_packet(
         event : Radio.RadioEvent, data : DataPacket, status : Radio.RadioEvent.Status
@@ -90,239 +230,141 @@ class TestCommunications(unittest.TestCase):
             bool :
                 True if number of TX and RX events matches number recorded by each node.
         """
-        result = True
-        for node_idx, node in enumerate(self.nodes):
-            result = result                                                  and \
-                (len(node._radio._tx_packet_history) == tx_events[node_idx]) and \
-                (len(node._radio._rx_packet_history) == rx_events[node_idx])
-        return result
+        return [
+            (len(node._radio._tx_packet_history), len(node._radio._rx_packet_history))
+            for node in self.nodes
+        ] == list(zip(tx_events, rx_events, strict=True))
             
-    def test_unicast(self):
-        """ Verify that sending a packet from one node to another elicits the
-        correct response from nodes.
-        """
-        def run():
-            """ Run the following communication sequence:
-            
-                0          5
-            A : +--- RX ---+
-            B : +== TX A ==+
-            C : 
-            """
-            yield self.env.all_of([
-                self.env.process(self.nodes[0]._radio.receive(self.duration + 1E-3)),
-                self.env.process(
-                    self.nodes[1]._radio.transmit(self.duration, self.packets["B->A"])
-                )
-            ])
-        
-        r = self.env.process(run())
-        self.env.run()
+    def _run_scenario(
+        self, actions : Iterable[Tuple], tx_events : Iterable[int],
+        rx_events : Iterable[int], expected_events : Iterable[Tuple]
+    ):
+        """ Run a communication scenario in which every node's radio action starts
+        at the same time, and verify the radio events logged by each node.
 
-        self.assertTrue(self.verify_num_events(tx_events=[0,1,0], rx_events=[1,0,0]))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[0]._radio._rx_packet_history[0], data=self.packets["B->A"],
-            status=Radio.RadioEvent.Status.SUCCESS_RX
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[1]._radio._tx_packet_history[0], data=self.packets["B->A"],
-            status=Radio.RadioEvent.Status.SUCCESS_TX
-        ))
-
-    def test_broadcast(self):
-        """ Verify that broadcasting a packet from one node to all others elicits the
-        correct response from nodes.
-        """
-        def run():
-            """ Run the following communication sequence:
-            
-                0          5
-            A : +--- RX ---+
-            B : +--- RX ---+
-            C : += TX ALL =+
-            """
-            yield self.env.all_of([
-                self.env.process(self.nodes[0]._radio.receive(self.duration + 1E-3)),
-                self.env.process(self.nodes[1]._radio.receive(self.duration + 1E-3)),
-                self.env.process(
-                    self.nodes[2]._radio.transmit(self.duration, self.packets["C->X"])
-                )
-            ])
-        
-        r = self.env.process(run())
-        self.env.run()
-
-        self.assertTrue(self.verify_num_events(tx_events=[0,0,1], rx_events=[1,1,0]))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[0]._radio._rx_packet_history[0], data=self.packets["C->X"],
-            status=Radio.RadioEvent.Status.SUCCESS_RX
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[1]._radio._rx_packet_history[0], data=self.packets["C->X"],
-            status=Radio.RadioEvent.Status.SUCCESS_RX
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[2]._radio._tx_packet_history[0], data=self.packets["C->X"],
-            status=Radio.RadioEvent.Status.SUCCESS_TX
-        ))
-
-    def test_listening(self):
-        """ Verify that listening for a packet without anything transmitting elicits
-        the correct response from nodes.
+        Parameters
+        ----------
+            actions :
+                The radio actions taking place; either ("rx", node index, duration)
+                or ("tx", node index, duration, packet key).
+            tx_events :
+                Number of TX events expected for each node.
+            rx_events :
+                Number of RX events expected for each node.
+            expected_events :
+                The radio events expected, each as (node index, "tx" or "rx" history,
+                index of the event in the history, packet key or None if no packet,
+                event status).
         """
         def run():
-            """ Run the following communication sequence:
-            
-                0          5
-            A : +--- RX ---+
-            B :
-            C : +--- RX ---+
+            """ Run the scenario's radio actions to completion.
             """
-            yield self.env.all_of([
-                self.env.process(
-                    self.nodes[0]._radio.receive(self.duration)
-                ),
-                self.env.process(
-                    self.nodes[2]._radio.receive(self.duration)
-                ),
-            ])
-        
-        r = self.env.process(run())
-        self.env.run()
-
-        self.assertTrue(self.verify_num_events(tx_events=[0,0,0], rx_events=[1,0,1]))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[0]._radio._rx_packet_history[0], data=None,
-            status=Radio.RadioEvent.Status.NOTHING_RX
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[2]._radio._rx_packet_history[0], data=None,
-            status=Radio.RadioEvent.Status.NOTHING_RX
-        ))
+            procs = []
+            for action in actions:
+                radio = self.nodes[action[1]]._radio
+                if action[0] == "rx":
+                    procs.append(self.env.process(radio.receive(action[2])))
+                else:
+                    procs.append(self.env.process(
+                        radio.transmit(action[2], self.packets[action[3]])
+                    ))
+            yield simpy.AllOf(self.env, procs)
 
-    def test_not_listening(self):
-        """ Verify that transmission of a packet without anything listening elicits
-        the correct response from nodes.
-        """
-        def run():
-            """ Run the following communication sequence:
-            
-                0          5
-            A : +== TX B ==+
-            B :
-            C : +== TX A ==+
-            """
-            yield self.env.all_of([
-                self.env.process(
-                    self.nodes[0]._radio.transmit(self.duration, self.packets["A->B"])
-                ),
-                self.env.process(
-                    self.nodes[2]._radio.transmit(self.duration, self.packets["C->A"])
-                )
-            ])
-        
         r = self.env.process(run())
-        self.env.run()
-
-        self.assertTrue(self.verify_num_events(tx_events=[1,0,1], rx_events=[1,1,0]))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[0]._radio._rx_packet_history[0], data=self.packets["C->A"],
-            status=Radio.RadioEvent.Status.DROPPED_MODE
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[1]._radio._rx_packet_history[0], data=self.packets["A->B"],
-            status=Radio.RadioEvent.Status.DROPPED_MODE
-        ))
+        self.env.run(until=r)
 
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[0]._radio._tx_packet_history[0], data=self.packets["A->B"],
-            status=Radio.RadioEvent.Status.SUCCESS_TX
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[2]._radio._tx_packet_history[0], data=self.packets["C->A"],
-            status=Radio.RadioEvent.Status.SUCCESS_TX
-        ))
+        self.assertTrue(self.verify_num_events(tx_events=tx_events, rx_events=rx_events))
+        for node_idx, history, event_idx, packet_key, status in expected_events:
+            radio = self.nodes[node_idx]._radio
+            events = radio._tx_packet_history if history == "tx" else radio._rx_packet_history
+            self.assertTrue(self.verify_radio_packet(
+                event=events[event_idx],
+                data=None if packet_key is None else self.packets[packet_key],
+                status=status
+            ))
 
     def test_collision(self):
         """ Verify that the collision between packets on the air elicits the correct
-        response from nodes.
-        """
-        def run():
-            """ Run the following communication sequence:
+        response from nodes, running the following communication sequence:
             
                 0          5
             A : +--- RX ---+
             B : +== TX A ==+
             C : +== TX A ==+
-            """
-            yield self.env.all_of([
-                self.env.process(
-                    self.nodes[0]._radio.receive(self.duration + 1E-3)
-                ),
-                self.env.process(
-                    self.nodes[1]._radio.transmit(self.duration, self.packets["B->A"])
-                ),
-                self.env.process(
-                    self.nodes[2]._radio.transmit(self.duration, self.packets["C->A"])
-                )
-            ])
-
-        r = self.env.process(run())
-        self.env.run()
+        """
+        start_time = self.env.now
+        self._run_scenario(
+            actions=[
+                ("rx", 0, RX_WINDOW), ("tx", 1, DURATION, "B->A"),
+                ("tx", 2, DURATION, "C->A")
+            ],
+            tx_events=[0,1,1], rx_events=[1,0,0],
+            expected_events=[
+                (0, "rx", 0, None, Radio.RadioEvent.Status.NOTHING_RX),
+                (1, "tx", 0, "B->A", Radio.RadioEvent.Status.SUCCESS_TX),
+                (2, "tx", 0, "C->A", Radio.RadioEvent.Status.SUCCESS_TX)
+            ]
+        )
 
-        self.assertTrue(self.verify_num_events(tx_events=[0,1,1], rx_events=[1,0,0]))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[0]._radio._rx_packet_history[0], data=None,
-            status=Radio.RadioEvent.Status.NOTHING_RX
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[1]._radio._tx_packet_history[0], data=self.packets["B->A"],
-            status=Radio.RadioEvent.Status.SUCCESS_TX
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[2]._radio._tx_packet_history[0], data=self.packets["C->A"],
-            status=Radio.RadioEvent.Status.SUCCESS_TX
+        # The packets collide as soon as they're transmitted, in whichever order
+        packet_from_b = RadioPacket(
+            data_packet=self.packets["B->A"], duration=DURATION, rssi=1.0
+        )
+        packet_from_c = RadioPacket(
+            data_packet=self.packets["C->A"], duration=DURATION, rssi=1.0
+        )
+        self.assertEqual(len(self.world._collision_packet_history), 1)
+        collision_event = self.world._collision_packet_history[0]
+        for packet_a, packet_b in (
+            (packet_from_b, packet_from_c), (packet_from_c, packet_from_b)
+        ):
+            self.assertEqual(collision_event, World.CollisionEvent(
+                status=World.CollisionEvent.Status.COLLISION, time=start_time,
+                packet_a=packet_a, packet_b=packet_b
+            ))
+        self.assertNotEqual(collision_event, World.CollisionEvent(
+            status=World.CollisionEvent.Status.COLLISION, time=start_time + 1,
+            packet_a=packet_from_c, packet_b=packet_from_b
         ))
+        self.assertEqual(self.world.get_collisions_at(start_time), [collision_event])
+        self.assertEqual(
+            self.world.get_collisions_between(start_time - 1, start_time + 1),
+            [collision_event]
+        )
+        self.assertEqual(
+            self.world.get_collisions_between(start_time + 1, start_time + DURATION),
+            []
+        )
 
-    def test_rssi(self):
-        """ Verify that the transmission of a radio packet whose signal strength is lower
-        than the threshold of the receiving node's radio elicits the correct response
+    def test_scenarios(self):
+        """ Verify that each of the communication scenarios elicits the correct response
         from nodes.
         """
-        def run():
-            """ Run the following communication sequence:
-            
-                0          5
-            A : +--- RX ---+
-            B :
-            C : +== TX A ==+
-            """
-            self.nodes[0]._radio._threshold_rssi = 2.0
-            yield self.env.all_of([
-                self.env.process(
-                    self.nodes[0]._radio.receive(self.duration + 1E-3)
-                ),
-                self.env.process(
-                    self.nodes[2]._radio.transmit(self.duration, self.packets["C->A"])
+        for scenario in SCENARIOS:
+            with self.subTest(scenario=scenario.name):
+                self._reset()
+                if scenario.threshold_rssi is not None:
+                    for node in self.nodes:
+                        node._radio._threshold_rssi = scenario.threshold_rssi
+                self._run_scenario(
+                    actions=scenario.actions, tx_events=scenario.tx_events,
+                    rx_events=scenario.rx_events,
+                    expected_events=scenario.expected_events
                 )
-            ])
 
-        r = self.env.process(run())
-        self.env.run()
+    def test_collision_history(self):
+        """ Verify that the collision history discards its oldest collisions once
+        full, and that only the collisions it holds are found over an interval.
+        """
+        history = CollisionEventHistory(maxlen=3)
+        for time in range(10):
+            history.append(time, self.packets["A->B"], self.packets["C->B"])
 
-        self.assertTrue(self.verify_num_events(tx_events=[0,0,1], rx_events=[2,0,0]))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[0]._radio._rx_packet_history[0], data=self.packets["C->A"],
-            status=Radio.RadioEvent.Status.DROPPED_RSSI
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[0]._radio._rx_packet_history[1], data=None,
-            status=Radio.RadioEvent.Status.NOTHING_RX
-        ))
-        self.assertTrue(self.verify_radio_packet(
-            event=self.nodes[2]._radio._tx_packet_history[0], data=self.packets["C->A"],
-            status=Radio.RadioEvent.Status.SUCCESS_TX
-        ))
+        self.assertEqual(len(history), 3)
+        self.assertEqual([event.time for event in history], [7, 8, 9])
+        self.assertEqual(history[-1].time, 9)
+        self.assertEqual([event.time for event in history.between(0, 8)], [7, 8])
+        self.assertEqual(history.between(10, 20), [])
 
     def test_partial(self):
         """ Verify that listening for only part of a transmitted packet's duration doesn't
@@ -336,18 +378,18 @@ class TestCommunications(unittest.TestCase):
             B :
             C :      +== TX A ==+
             """
-            yield self.env.any_of([
+            yield simpy.AnyOf(self.env, [
                 self.env.process(
-                    self.nodes[0]._radio.receive(self.duration)
+                    self.nodes[0]._radio.receive(DURATION)
                 ),
                 self.env.timeout(2.5)
             ])
             yield self.env.process(
-                self.nodes[2]._radio.transmit(self.duration, self.packets["C->A"])
+                self.nodes[2]._radio.transmit(DURATION, self.packets["C->A"])
             )
 
         r = self.env.process(run())
-        self.env.run()
+        self.env.run(until=r)
 
         self.assertTrue(self.verify_num_events(tx_events=[0,0,1], rx_events=[1,0,0]))
         self.assertTrue(self.verify_radio_packet(
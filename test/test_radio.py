@@ -0,0 +1,235 @@
+###
+### Python standard dependencies
+###
+import logging
+import unittest
+from typing import List
+###
+### Third-party dependencies
+###
+import simpy
+###
+### Project dependencies
+###
+from network.Logger import initialise_sim_logger
+from network.Node import Node
+from network.Packet import DataPacket
+from network.Radio import Radio, RadioPacket, RadioEventRing
+
+class TestRadioEventRing(unittest.TestCase):
+    """ Various tests for the RadioEventRing holding a radio's event history.
+    """
+
+    @staticmethod
+    def make_packet(idx : int) -> RadioPacket:
+        """ Create a radio packet distinguishable by its index.
+
+        Parameters
+        ----------
+            idx :
+                Index carried by the packet.
+
+        Returns
+        -------
+            RadioPacket
+                The radio packet.
+        """
+        return RadioPacket(
+            data_packet=DataPacket(src="A", dest="B", contents={"Index" : idx}),
+            duration=5, rssi=1.0
+        )
+
+    @staticmethod
+    def status_of(idx : int) -> Radio.RadioEvent.Status:
+        """ Status given to the event pushed with a given index; alternates between
+        successful transmits and receives.
+
+        Parameters
+        ----------
+            idx :
+                Index of the pushed event.
+
+        Returns
+        -------
+            Radio.RadioEvent.Status
+                The status of the event.
+        """
+        if idx % 2 == 0:
+            return Radio.RadioEvent.Status.SUCCESS_TX
+        return Radio.RadioEvent.Status.SUCCESS_RX
+
+    def fill(self, ring : RadioEventRing, num_events : int):
+        """ Push events onto a ring, where the event pushed with index i takes
+        place at time i.
+
+        Parameters
+        ----------
+            ring :
+                The ring to push events onto.
+            num_events :
+                Number of events to push.
+        """
+        for idx in range(num_events):
+            ring.push(
+                status=self.status_of(idx).value, time=idx, packet=self.make_packet(idx)
+            )
+
+    def expected_events(self, idxs : range) -> List[Radio.RadioEvent]:
+        """ The events expected to be held by a ring filled by `fill`.
+
+        Parameters
+        ----------
+            idxs :
+                Indices of the events held, from oldest to newest.
+
+        Returns
+        -------
+            List[Radio.RadioEvent]
+                The expected events.
+        """
+        return [
+            Radio.RadioEvent(
+                status=self.status_of(idx), time=idx, packet=self.make_packet(idx)
+            )
+            for idx in idxs
+        ]
+
+    def test_push(self):
+        """ Verify that events pushed onto a ring that isn't full are retrieved from
+        oldest to newest.
+        """
+        ring = RadioEventRing(capacity=5)
+        self.fill(ring, 3)
+
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(list(ring), self.expected_events(range(3)))
+        self.assertEqual(ring[-1], self.expected_events(range(2, 3))[0])
+        self.assertRaises(IndexError, ring.__getitem__, 3)
+        self.assertRaises(IndexError, ring.__getitem__, -4)
+
+    def test_event_str(self):
+        """ Verify that events name their status when stringified.
+        """
+        ring = RadioEventRing(capacity=5)
+        self.fill(ring, 1)
+
+        self.assertIn("Status: Status.SUCCESS_TX,", str(ring[0]))
+
+    def test_wrap(self):
+        """ Verify that once a ring is full, each event pushed overwrites the oldest.
+        """
+        ring = RadioEventRing(capacity=5)
+        self.fill(ring, 12)
+
+        self.assertEqual(len(ring), 5)
+        self.assertEqual(list(ring), self.expected_events(range(7, 12)))
+        self.assertEqual(ring[0], self.expected_events(range(7, 8))[0])
+
+    def test_grow(self):
+        """ Verify that an unbounded ring keeps every event pushed, growing as it
+        needs to.
+        """
+        ring = RadioEventRing()
+        self.fill(ring, 100)
+
+        self.assertEqual(len(ring), 100)
+        self.assertEqual(list(ring), self.expected_events(range(100)))
+
+    def test_no_capacity(self):
+        """ Verify that a ring with no capacity discards every event, and that a
+        ring can't have a negative capacity.
+        """
+        ring = RadioEventRing(capacity=0)
+        self.fill(ring, 3)
+
+        self.assertEqual(len(ring), 0)
+        self.assertEqual(list(ring), [])
+        self.assertEqual(
+            Radio.RadioEvent.get_events(ring, Radio.RadioEvent.Status.SUCCESS_TX), []
+        )
+        self.assertRaises(RuntimeError, RadioEventRing, -1)
+
+    def test_get_events(self):
+        """ Verify that retrieving the events of a given status returns the time and
+        packet of each, from oldest to newest, including once the ring has wrapped.
+        """
+        ring = RadioEventRing(capacity=5)
+        self.fill(ring, 8)
+
+        self.assertEqual(
+            Radio.RadioEvent.get_events(ring, Radio.RadioEvent.Status.SUCCESS_TX),
+            [(idx, self.make_packet(idx)) for idx in (4, 6)]
+        )
+        self.assertEqual(
+            Radio.RadioEvent.get_events(ring, Radio.RadioEvent.Status.SUCCESS_RX),
+            [(idx, self.make_packet(idx)) for idx in (3, 5, 7)]
+        )
+        self.assertEqual(
+            Radio.RadioEvent.get_events(ring, Radio.RadioEvent.Status.NOTHING_RX), []
+        )
+
+class TestRadioHistory(unittest.TestCase):
+    """ Various tests for the history of packets kept by a node's radio.
+    """
+
+    def setUp(self):
+        """ Setup the logger and simpy environment used by a test.
+        """
+        self.env = simpy.Environment()
+        initialise_sim_logger(self.env, logging.INFO)
+
+    def transmit_all(self, node : Node, num_packets : int):
+        """ Transmit packets from a node one after another, until all have been
+        transmitted.
+
+        Parameters
+        ----------
+            node :
+                The node transmitting.
+            num_packets :
+                Number of packets to transmit.
+        """
+        def run():
+            """ Transmit each packet once the previous transmission has completed.
+            """
+            for packet_idx in range(num_packets):
+                yield node._radio.start_transmit(
+                    1, DataPacket(src=node._name, dest="B", contents={"Index" : packet_idx})
+                )
+
+        r = self.env.process(run())
+        self.env.run(until=r)
+
+    def test_bounded_history(self):
+        """ Verify that by default, a node's radio only keeps its most recent packets.
+        """
+        node = Node(self.env, "A")
+        self.transmit_all(node, 150)
+
+        history = node._radio._tx_packet_history
+        self.assertEqual(len(history), 100)
+        self.assertEqual(history[0].packet.data_packet.data(), {"Index" : 50})
+
+    def test_unbounded_history(self):
+        """ Verify that a node can be made to keep the history of every packet its
+        radio transmits.
+        """
+        node = Node(self.env, "A", history_capacity=None)
+        self.transmit_all(node, 150)
+
+        history = node._radio._tx_packet_history
+        self.assertEqual(len(history), 150)
+        self.assertEqual(
+            [event.packet.data_packet.data()["Index"] for event in history],
+            list(range(150))
+        )
+
+    def test_no_world(self):
+        """ Verify that a radio which isn't in a world still logs its transmissions,
+        without holding on to the packets for a world to route.
+        """
+        node = Node(self.env, "A")
+        self.transmit_all(node, 10)
+
+        self.assertEqual(len(node._radio._tx_packet_history), 10)
+        self.assertIsNone(node._radio._transmit_queue)
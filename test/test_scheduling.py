@@ -3,6 +3,7 @@
 ###
 import logging
 import unittest
+import itertools
 from functools import partial
 ###
 ### Third-party dependencies
@@ -14,19 +15,16 @@ import simpy
 from network.Logger import initialise_sim_logger
 from network.Packet import DataPacket
 from network.Radio import Radio, RadioMode, RadioPacket
-from network.Schedule import Schedule
+from network.Schedule import Schedule, ScheduleState
 from network.ScheduleManager import ScheduleManager
 
 class TestScheduling(unittest.TestCase):
     """ Various tests for Schedule and ScheduleManager classes.
     """
     
-    def __init__(self, *args, **kwargs):
-        """ Class constructor.
-
-        Setup the logger and simpy environment that'll be used throughout.
+    def setUp(self):
+        """ Setup the logger and simpy environment used by a test.
         """
-        super(TestScheduling, self).__init__(*args, **kwargs)
         self.env = simpy.Environment()
         initialise_sim_logger(self.env, logging.INFO)
 
@@ -39,51 +37,43 @@ class TestScheduling(unittest.TestCase):
         packet_start_time = 10
         inter_packet_delay = 20
 
-        class DummyFunctor:
-            """ Functor that increments state held within on every call.
-            """
-
-            def __init__(self):
-                """ Class constructor.
-                """
-                self.var = 0
-                
-            def __call__(self):
-                """ Overload of (); increment internal state and return it.
-                """
-                self.var += 1
-                return self.var
-
-        # Create a schedule whose packet generator invokes the above functor
-        # to increment the field on each packet generation
-        dummy_var = DummyFunctor()
+        # Create a schedule whose packet generator draws from the counter to
+        # increment the field on each packet generation
+        counter = itertools.count(1)
         sched = Schedule(
             start=packet_start_time, duration=5, delay=inter_packet_delay,
             num=num_packets, mode=RadioMode.TX,
             packet_constructor=lambda: DataPacket(
-                src="A", dest="B", fields={"Var" : dummy_var}
+                src="A", dest="B", fields={"Var" : lambda: next(counter)}
             )
         )
 
+        scheduled_packets = []
         def run():
-            """ Invoke the schedule and generate a packet each time. Verify that the
-            packet contains the expected contents each time, and that querying the
-            Schedule when it expires results in the expected behaviour.
+            """ Invoke the schedule and generate a packet each time, verifying that
+            querying the Schedule when it expires results in the expected behaviour.
             """
             for packet_idx in range(num_packets):
                 self.assertEqual(
                     sched.next_time(), packet_start_time + packet_idx * inter_packet_delay
                 )
                 yield self.env.timeout(sched.next_time() - self.env.now)
-                scheduled_packet = next(sched.event())
-                self.assertEqual(
-                    scheduled_packet,
-                    DataPacket(src="A", dest="B", contents={"Var" : packet_idx + 1})
-                )
+                scheduled_packets.append(sched.next_event())
             self.assertRaises(RuntimeError, sched.next_time)
                 
         r = self.env.process(run())
-        self.env.run(until=150)
+        self.env.run(until=r)
+
+        # Verify that the packets contain the expected contents, in the order they
+        # were generated, all in one comparison. Packet fields are evaluated when the
+        # packet is constructed, so the contents are those drawn at generation time
+        self.assertEqual(
+            scheduled_packets,
+            [
+                DataPacket(src="A", dest="B", contents={"Var" : packet_idx + 1})
+                for packet_idx in range(num_packets)
+            ]
+        )
 
     def test_manager(self):
         """ Verify that schedule managers are able to function and interact with
@@ -108,10 +98,10 @@ class TestScheduling(unittest.TestCase):
         radio_b = Radio(self.env, "B")
 
         scheduler_a = ScheduleManager(
-            self.env, radio_a.transmit, radio_a.receive, dummy_handler
+            self.env, radio_a.start_transmit, radio_a.receive, dummy_handler
         )
         scheduler_b = ScheduleManager(
-            self.env, radio_b.transmit, radio_b.receive, dummy_handler
+            self.env, radio_b.start_transmit, radio_b.receive, dummy_handler
         )
 
         tx_packet = DataPacket(src="A", dest="B", fields={})
@@ -125,7 +115,7 @@ class TestScheduling(unittest.TestCase):
             start=tx_start_time, duration=tx_duration, delay=tx_delay,
             num=tx_num, mode=RadioMode.TX, packet_constructor=lambda: tx_packet
         )
-        scheduler_a.add(tx_sched)
+        scheduler_a.add_many([tx_sched])
         # scheduler_b will listen at times:
         # [ 5, 20], [25, 40], [45, 60], [65, 80], [85, 100] 
         rx_start_time = 5
@@ -136,14 +126,18 @@ class TestScheduling(unittest.TestCase):
             start=rx_start_time, duration=rx_duration, delay=rx_delay, num=rx_num,
             mode=RadioMode.RX
         )
-        scheduler_b.add(rx_sched)
+        scheduler_b.add_many([rx_sched])
+
+        # There's no world here, so stand in for one by giving the transmitting
+        # radio a queue to transmit onto
+        radio_a._transmit_queue = simpy.Store(self.env)
         
         def run():
             """ Wait for a transmission event, timeout for the packet duration
             and pass the packet onto the listening radio.
             """
             for _ in range(tx_num):
-                packet = yield radio_a._transmit_event.event
+                packet = yield radio_a._transmit_queue.get()
                 yield self.env.timeout(tx_duration)
                 radio_b._receive_event.reactivate(packet)
 
@@ -154,31 +148,207 @@ class TestScheduling(unittest.TestCase):
         # received none
         self.assertEqual(len(radio_a._tx_packet_history), tx_num)
         self.assertEqual(len(radio_a._rx_packet_history), 0)
-        for tx_idx, tx_event in enumerate(radio_a._tx_packet_history):
-            self.assertEqual(
-                tx_event,
-                Radio.PacketEvent(
-                    status=Radio.PacketEvent.Status.SUCCESS,
-                    time=tx_start_time + tx_duration + tx_idx*tx_delay,
-                    packet=RadioPacket(
-                        data_packet=tx_packet, duration=tx_duration, rssi=1.0
-                    )
+        # Every packet is transmitted and received identically, only the times at
+        # which they traverse the radios differ
+        expected_packet = RadioPacket(data_packet=tx_packet, duration=tx_duration, rssi=1.0)
+        expected_times = [
+            tx_start_time + tx_duration + tx_idx*tx_delay for tx_idx in range(tx_num)
+        ]
+        self.assertEqual(
+            list(radio_a._tx_packet_history),
+            [
+                Radio.RadioEvent(
+                    status=Radio.RadioEvent.Status.SUCCESS_TX, time=time,
+                    packet=expected_packet
                 )
-            )
+                for time in expected_times
+            ]
+        )
 
         # The listening radio should have received 5 packets and transmitted
         # none
         self.assertEqual(dummy_handler.counter, rx_num)
         self.assertEqual(len(radio_b._tx_packet_history), 0)
         self.assertEqual(len(radio_b._rx_packet_history), rx_num)
-        for rx_idx, rx_event in enumerate(radio_b._rx_packet_history):
-            self.assertEqual(
-                rx_event,
-                Radio.PacketEvent(
-                    status=Radio.PacketEvent.Status.SUCCESS,
-                    time=tx_start_time + tx_duration + rx_idx*tx_delay,
-                    packet=RadioPacket(
-                        data_packet=tx_packet, duration=tx_duration, rssi=1.0
-                    )
+        self.assertEqual(
+            list(radio_b._rx_packet_history),
+            [
+                Radio.RadioEvent(
+                    status=Radio.RadioEvent.Status.SUCCESS_RX, time=time,
+                    packet=expected_packet
+                )
+                for time in expected_times
+            ]
+        )
+
+    def test_manager_transmit_cb(self):
+        """ Verify that a schedule manager can't be given a transmit callback that
+        needs running as a process, since it'd never transmit anything.
+        """
+        radio = Radio(self.env, "A")
+        self.assertRaises(
+            RuntimeError, ScheduleManager, self.env, radio.transmit, radio.receive, None
+        )
+
+    def test_manager_off_schedule(self):
+        """ Verify that the schedule manager works through a schedule whose mode it
+        has nothing to enact for, rather than getting stuck on it.
+        """
+        scheduler = ScheduleManager(self.env, None, None, None)
+        sched = Schedule(start=10, duration=5, delay=20, num=3, mode=RadioMode.OFF)
+        scheduler.add(sched)
+        self.env.run(until=100)
+
+        self.assertEqual(sched.state, ScheduleState.COMPLETE)
+        self.assertEqual(len(scheduler._schedules), 0)
+
+    def test_manager_cancel(self):
+        """ Verify that cancelling schedules stops the schedule manager from
+        enacting any of their remaining events, including when enough schedules
+        are cancelled that the manager discards them all at once.
+        """
+        transmitted = []
+
+        def dummy_transmit(duration : int, packet : DataPacket):
+            """ Dummy transmission which records the packet transmitted.
+
+            Parameters
+            ----------
+                duration :
+                    Duration of the transmission.
+                packet :
+                    The data packet to be transmitted.
+            """
+            transmitted.append(packet)
+
+        scheduler = ScheduleManager(self.env, dummy_transmit, None, None)
+        other_scheduler = ScheduleManager(self.env, dummy_transmit, None, None)
+
+        # Each schedule transmits a packet carrying its index at times:
+        # 10, 30, 50, 70, 90
+        num_scheds = 20
+        scheds = [
+            Schedule(
+                start=10, duration=5, delay=20, num=5, mode=RadioMode.TX,
+                packet_constructor=partial(
+                    DataPacket, src="A", dest="B", contents={"Index" : sched_idx}
                 )
             )
+            for sched_idx in range(num_scheds)
+        ]
+        scheduler.add_many(scheds)
+
+        # Cancel all but the first few schedules after their second transmission
+        num_kept = 3
+        def run():
+            """ Cancel schedules part way through, and verify that they can't be
+            cancelled a second time, nor by a manager they weren't added to.
+            """
+            yield self.env.timeout(40)
+            for sched in scheds:
+                self.assertFalse(other_scheduler.cancel(sched))
+            for sched in scheds[num_kept:]:
+                self.assertTrue(scheduler.cancel(sched))
+            for sched in scheds[num_kept:]:
+                self.assertFalse(scheduler.cancel(sched))
+
+        r = self.env.process(run())
+        self.env.run(until=150)
+
+        expected = sorted(
+            [sched_idx for sched_idx in range(num_scheds) for _ in range(2)] +
+            [sched_idx for sched_idx in range(num_kept) for _ in range(3)]
+        )
+        self.assertEqual(
+            sorted(packet.data()["Index"] for packet in transmitted), expected
+        )
+        self.assertEqual(len(scheduler._schedules), 0)
+        self.assertEqual(scheduler._cancelled_count, 0)
+        self.assertEqual(other_scheduler._cancelled_count, 0)
+
+    def test_manager_event_log(self):
+        """ Verify that the schedule manager logs every event of the schedules
+        added to it.
+        """
+        scheduler = ScheduleManager(self.env, None, None, None)
+        scheduler.add(Schedule(start=5, duration=2, delay=10, num=3, mode=RadioMode.RX))
+        scheduler.add(Schedule(
+            start=0, duration=4, delay=4, num=2, mode=RadioMode.TX,
+            packet_constructor=lambda: DataPacket(src="A", dest="B", contents={})
+        ))
+
+        self.assertEqual(
+            scheduler.schedule_events(),
+            [
+                ScheduleManager.ScheduleEvent(start=5, stop=7, mode=RadioMode.RX),
+                ScheduleManager.ScheduleEvent(start=15, stop=17, mode=RadioMode.RX),
+                ScheduleManager.ScheduleEvent(start=25, stop=27, mode=RadioMode.RX),
+                ScheduleManager.ScheduleEvent(start=0, stop=4, mode=RadioMode.TX),
+                ScheduleManager.ScheduleEvent(start=4, stop=8, mode=RadioMode.TX)
+            ]
+        )
+
+        # Schedules needn't start, or repeat, at integral times
+        scheduler.add(Schedule(start=0.5, duration=1, delay=2.5, num=2, mode=RadioMode.RX))
+        self.assertEqual(
+            scheduler.schedule_events()[-2:],
+            [
+                ScheduleManager.ScheduleEvent(start=0.5, stop=1.5, mode=RadioMode.RX),
+                ScheduleManager.ScheduleEvent(start=3.0, stop=4.0, mode=RadioMode.RX)
+            ]
+        )
+
+    def test_manager_add_while_running(self):
+        """ Verify that schedules added while the schedule manager is running are
+        enacted at the right times, whether they trigger before or after the
+        schedules the manager already holds.
+        """
+        transmit_times = []
+
+        def dummy_transmit(duration : int, packet : DataPacket):
+            """ Dummy transmission which records the time of transmission.
+
+            Parameters
+            ----------
+                duration :
+                    Duration of the transmission.
+                packet :
+                    The data packet to be transmitted.
+            """
+            transmit_times.append(self.env.now)
+
+        scheduler = ScheduleManager(self.env, dummy_transmit, None, None)
+
+        def tx_schedule(start : int) -> Schedule:
+            """ Create a schedule transmitting a single packet.
+
+            Parameters
+            ----------
+                start :
+                    Simulation time of the transmission.
+
+            Returns
+            -------
+                Schedule
+                    The schedule.
+            """
+            return Schedule(
+                start=start, duration=5, delay=5, num=1, mode=RadioMode.TX,
+                packet_constructor=lambda: DataPacket(src="A", dest="B", contents={})
+            )
+
+        def run():
+            """ Add schedules triggering both before and after the schedule the manager
+            is waiting on, then once the manager has run out of schedules.
+            """
+            scheduler.add(tx_schedule(100))
+            yield self.env.timeout(10)
+            scheduler.add(tx_schedule(20))
+            scheduler.add(tx_schedule(50))
+            yield self.env.timeout(140)
+            scheduler.add(tx_schedule(160))
+
+        r = self.env.process(run())
+        self.env.run(until=200)
+
+        self.assertEqual(transmit_times, [20, 50, 100, 160])